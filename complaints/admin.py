@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Complaint, StatusUpdate
+from .models import AssignmentProfile, Complaint, StatusUpdate, StaffPerformance
 
 @admin.register(Complaint)
 class ComplaintAdmin(admin.ModelAdmin):
@@ -34,4 +34,17 @@ class StatusUpdateAdmin(admin.ModelAdmin):
     list_display = ['complaint', 'old_status', 'new_status', 'updated_by', 'created_at']
     list_filter = ['new_status', 'created_at']
     search_fields = ['complaint__complaint_id', 'notes']
-    readonly_fields = ['created_at']
\ No newline at end of file
+    readonly_fields = ['created_at']
+    list_select_related = ['complaint', 'updated_by']
+
+@admin.register(StaffPerformance)
+class StaffPerformanceAdmin(admin.ModelAdmin):
+    list_display = ['staff', 'assigned', 'pending', 'in_progress', 'resolved', 'updated_at']
+    search_fields = ['staff__username']
+    readonly_fields = ['updated_at']
+
+@admin.register(AssignmentProfile)
+class AssignmentProfileAdmin(admin.ModelAdmin):
+    list_display = ['staff', 'categories', 'areas', 'max_open', 'auto_assign']
+    list_filter = ['auto_assign']
+    search_fields = ['staff__username']
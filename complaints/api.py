@@ -0,0 +1,318 @@
+import hashlib
+import math
+from datetime import date, timedelta
+from functools import wraps
+from django.db.models import Avg, Count, F, Max, Value
+from django.db.models.functions import Coalesce, Substr
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils import timezone
+from django.utils.http import http_date, quote_etag
+from . import archive, trends
+from .filters import filter_complaints
+from .geo import bounding_box, haversine_km
+from .models import Complaint, StatusHistoryArchive, StatusUpdate
+from .pagination import paginate
+
+MAX_LOCATION_RESULTS = 500
+# Larger radius searches are capped to this, which covers any one service region
+MAX_RADIUS_KM = 100
+# Candidates fetched per requested result, absorbing the gap between the SQL
+# ordering and the exact distance
+RADIUS_CANDIDATE_FACTOR = 2
+
+# Categories that point at network faults and are worth clustering
+HOTSPOT_CATEGORIES = ['leak', 'no_water']
+
+
+def api_error(message, status=400):
+    return JsonResponse({'error': message}, status=status)
+
+
+def login_api(view):
+    """Answer anonymous API calls with 401 JSON instead of a login redirect"""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return api_error('Authentication required.', status=401)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def staff_api(view):
+    """JSON equivalent of the staff/manager permission checks in the HTML views"""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return api_error('Authentication required.', status=401)
+        if not request.user.is_staff_member() and not request.user.is_manager():
+            return api_error('You do not have permission to use this endpoint.', status=403)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def manager_api(view):
+    """JSON equivalent of the manager-only permission check"""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return api_error('Authentication required.', status=401)
+        if not request.user.is_manager():
+            return api_error('Only managers can use this endpoint.', status=403)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def _floats(value, count):
+    """Parse a comma-separated list of exactly ``count`` floats, or None"""
+    try:
+        numbers = [float(part) for part in value.split(',')]
+    except (AttributeError, ValueError):
+        return None
+    return numbers if len(numbers) == count else None
+
+
+def _int_param(request, name, default, minimum, maximum):
+    try:
+        value = int(request.GET.get(name, default))
+    except (TypeError, ValueError):
+        value = default
+    return max(minimum, min(value, maximum))
+
+
+@staff_api
+def complaints_nearby(request):
+    """Complaints inside a bounding box (?bbox=min_lat,min_lon,max_lat,max_lon)
+    or within a radius of a point (?lat=&lon=&radius_km=)"""
+    limit = _int_param(request, 'limit', 100, 1, MAX_LOCATION_RESULTS)
+    center = None
+    
+    if 'bbox' in request.GET:
+        bbox = _floats(request.GET['bbox'], 4)
+        if not bbox:
+            return api_error('bbox must be min_lat,min_lon,max_lat,max_lon.')
+    else:
+        point = _floats(f"{request.GET.get('lat')},{request.GET.get('lon')},{request.GET.get('radius_km', '1')}", 3)
+        if not point or point[2] <= 0:
+            return api_error('Provide bbox, or lat, lon and a positive radius_km.')
+        center = (point[0], point[1], min(point[2], MAX_RADIUS_KM))
+        bbox = bounding_box(*center)
+    
+    min_lat, min_lon, max_lat, max_lon = bbox
+    complaints = Complaint.objects.filter(
+        latitude__range=(min_lat, max_lat),
+        longitude__range=(min_lon, max_lon),
+    )
+    if request.GET.get('status') == 'open':
+        complaints = complaints.open()
+    if request.GET.get('category'):
+        complaints = complaints.filter(category__in=request.GET['category'].split(','))
+    
+    fields = ['complaint_id', 'title', 'category', 'priority', 'status', 'latitude', 'longitude', 'created_at']
+    if center is None:
+        results = list(complaints.values(*fields)[:limit])
+    else:
+        # The box is a cheap index filter. SQL orders its rows by flat-earth distance,
+        # which ranks like the true distance at these radii, so only the nearest
+        # candidates get the exact check.
+        lat, lon, radius_km = center
+        cos_lat = Value(math.cos(math.radians(lat)))
+        approximate = (F('latitude') - lat) * (F('latitude') - lat) + \
+            (F('longitude') - lon) * cos_lat * (F('longitude') - lon) * cos_lat
+        candidates = complaints.annotate(approximate_distance=approximate).order_by('approximate_distance')
+        results = []
+        for row in candidates.values(*fields)[:limit * RADIUS_CANDIDATE_FACTOR]:
+            row['distance_km'] = round(haversine_km(lat, lon, row['latitude'], row['longitude']), 3)
+            if row['distance_km'] <= radius_km:
+                results.append(row)
+        results = sorted(results, key=lambda row: row['distance_km'])[:limit]
+    
+    return JsonResponse({'count': len(results), 'results': results})
+
+
+@staff_api
+def complaint_hotspots(request):
+    """Group open leak/no-water complaints into geohash cells with at least min_count reports.
+
+    precision 5 cells are roughly 5 km across, 6 about 1 km and 7 about 150 m.
+    """
+    precision = _int_param(request, 'precision', 6, 3, 8)
+    min_count = _int_param(request, 'min_count', 3, 1, 100000)
+    categories = request.GET.get('category', ','.join(HOTSPOT_CATEGORIES)).split(',')
+    
+    cells = (
+        Complaint.objects.open()
+        .filter(category__in=categories, geohash__isnull=False)
+        .annotate(cell=Substr('geohash', 1, precision))
+        .order_by()
+        .values('cell')
+        .annotate(count=Count('id'), latitude=Avg('latitude'), longitude=Avg('longitude'))
+        .filter(count__gte=min_count)
+        .order_by('-count')[:MAX_LOCATION_RESULTS]
+    )
+    results = [
+        {
+            'geohash': cell['cell'],
+            'count': cell['count'],
+            'latitude': round(cell['latitude'], 6),
+            'longitude': round(cell['longitude'], 6),
+        }
+        for cell in cells
+    ]
+    
+    return JsonResponse({'count': len(results), 'results': results})
+
+
+# Fields returned for each complaint by the status API
+STATUS_FIELDS = ['complaint_id', 'title', 'category', 'priority', 'status', 'created_at', 'updated_at', 'resolved_at']
+STATUS_LABELS = dict(Complaint.STATUS_CHOICES)
+
+
+def conditional_json(request, version, last_modified, build):
+    """Return ``build()`` as JSON, or 304 Not Modified when the client already holds ``version``.
+
+    ``build`` is only called on a miss, so unchanged polls skip the queries and
+    serialization behind the body.
+    """
+    etag = quote_etag(hashlib.md5(version.encode()).hexdigest())
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = JsonResponse(build())
+    response['ETag'] = etag
+    if timestamp is not None:
+        response['Last-Modified'] = http_date(timestamp)
+    # Pollers must revalidate, and only the owner may reuse a copy
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _visible_complaints(user):
+    if user.is_customer():
+        return Complaint.objects.filter(customer=user)
+    return Complaint.objects.all()
+
+
+def _status_rows(complaints):
+    rows = list(complaints.values(*STATUS_FIELDS, assigned_to_name=F('assigned_to__username')))
+    for row in rows:
+        row['status_display'] = STATUS_LABELS.get(row['status'], row['status'])
+    return rows
+
+
+def _complaint_version(request, complaint_id):
+    """(pk, validator string, last-modified) for a visible complaint in one query, or None"""
+    row = (
+        _visible_complaints(request.user)
+        .filter(complaint_id=complaint_id)
+        .annotate(last_update=Coalesce(Max('status_updates__created_at'), 'history_archive__last_update_at'))
+        .values('pk', 'updated_at', 'last_update')
+        .first()
+    )
+    if row is None:
+        return None
+    last_modified = max(filter(None, [row['updated_at'], row['last_update']]))
+    return row['pk'], f"{row['pk']}:{row['updated_at'].isoformat()}:{row['last_update']}", last_modified
+
+
+@login_api
+def complaint_status(request, complaint_id):
+    """Current status of one complaint; cheap to poll with If-None-Match"""
+    version = _complaint_version(request, complaint_id)
+    if version is None:
+        return api_error('Complaint not found.', status=404)
+    pk, validator, last_modified = version
+    
+    def build():
+        row = _status_rows(Complaint.objects.filter(pk=pk))[0]
+        row['last_update'] = (
+            StatusUpdate.objects.filter(complaint_id=pk).aggregate(last=Max('created_at'))['last']
+            or StatusHistoryArchive.objects.filter(complaint_id=pk).values_list('last_update_at', flat=True).first()
+        )
+        return row
+    
+    return conditional_json(request, f'status:{validator}', last_modified, build)
+
+
+@login_api
+def complaint_history(request, complaint_id):
+    """Status updates of one complaint, newest first, including archived ones"""
+    version = _complaint_version(request, complaint_id)
+    if version is None:
+        return api_error('Complaint not found.', status=404)
+    pk, validator, last_modified = version
+    
+    def build():
+        updates = [
+            {
+                'old_status': update.old_status,
+                'new_status': update.new_status,
+                'notes': update.notes,
+                'created_at': update.created_at,
+                'updated_by_name': update.updated_by.username,
+            }
+            for update in archive.full_history(Complaint(pk=pk))
+        ]
+        return {'complaint_id': complaint_id, 'count': len(updates), 'results': updates}
+    
+    return conditional_json(request, f'history:{validator}', last_modified, build)
+
+
+@login_api
+def complaint_list(request):
+    """Keyset-paginated complaint statuses: a customer's own, or all with filters for staff"""
+    complaints = _visible_complaints(request.user)
+    if not request.user.is_customer():
+        complaints, _ = filter_complaints(complaints, request.GET)
+    
+    # Only the page's keys and versions are read before deciding on a 304
+    page = paginate(complaints.only('id', 'complaint_id', 'created_at', 'updated_at'), request.GET)
+    validator = ','.join(f'{c.pk}:{c.updated_at.isoformat()}' for c in page)
+    validator += f':{page.has_next}:{page.has_previous}'
+    last_modified = max((c.updated_at for c in page), default=None)
+    
+    def build():
+        rows = {row['complaint_id']: row for row in _status_rows(Complaint.objects.filter(pk__in=[c.pk for c in page]))}
+        return {
+            'count': len(page),
+            'results': [rows[c.complaint_id] for c in page if c.complaint_id in rows],
+            'next': f'{request.path}?{page.next_query}' if page.has_next else None,
+            'previous': f'{request.path}?{page.previous_query}' if page.has_previous else None,
+        }
+    
+    return conditional_json(request, f'list:{validator}', last_modified, build)
+
+
+# Longest range a trend request may cover
+MAX_TREND_DAYS = 3 * 366
+
+
+def _date_param(request, name, default):
+    try:
+        return date.fromisoformat(request.GET[name])
+    except (KeyError, ValueError):
+        return default
+
+
+@manager_api
+def complaint_trends(request):
+    """Submissions, resolutions and SLA breaches per day/week/month from the daily rollup
+    (?start=&end=&period=&group_by=category|staff&category=&staff=)"""
+    end = _date_param(request, 'end', timezone.localdate())
+    start = _date_param(request, 'start', end - timedelta(days=90))
+    period = request.GET.get('period', 'day')
+    group_by = request.GET.get('group_by') or None
+    if period not in trends.PERIODS:
+        return api_error(f"period must be one of {', '.join(trends.PERIODS)}.")
+    if group_by and group_by not in trends.GROUPS:
+        return api_error(f"group_by must be one of {', '.join(trends.GROUPS)}.")
+    if start > end or (end - start).days > MAX_TREND_DAYS:
+        return api_error(f'start must be before end and at most {MAX_TREND_DAYS} days earlier.')
+    
+    results = trends.trend_series(
+        start, end, period, group_by,
+        category=request.GET.get('category'),
+        staff_id=_int_param(request, 'staff', 0, 0, 2**31 - 1) or None,
+    )
+    return JsonResponse({'start': start, 'end': end, 'period': period, 'count': len(results), 'results': results})
+
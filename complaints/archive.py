@@ -0,0 +1,181 @@
+import json
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone as dt_timezone
+from types import SimpleNamespace
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import Complaint, StatusHistoryArchive, StatusUpdate
+from .stats import CLOSED_STATUSES
+
+DEFAULT_BATCH_SIZE = 500
+
+# Archive blobs are zlib streams of compact JSON entries:
+# [seconds since the previous entry, old status index, new status index, notes, updated_by id]
+STATUS_CODES = ['', *(value for value, label in Complaint.STATUS_CHOICES)]
+FORMAT_VERSION = 1
+# Preset dictionary that lets zlib compress the short per-complaint histories.
+# Changing it makes existing archives unreadable, so bump FORMAT_VERSION instead.
+ZDICT = (
+    b'Complaint assigned to Status changed to submitted in_progress resolved closed '
+    b'Issue resolved Bills corrected Repair completed Team dispatched [0,1,2,"'
+)
+
+# StatusUpdate columns read for each archived update, in pack() order
+ENTRY_FIELDS = ['created_at', 'old_status', 'new_status', 'notes', 'updated_by_id']
+
+
+@dataclass
+class ArchivedUpdate:
+    """An archived status update, shaped like StatusUpdate for templates and the API"""
+    created_at: datetime
+    old_status: str
+    new_status: str
+    notes: str
+    updated_by: SimpleNamespace
+
+    @property
+    def updated_by_id(self):
+        return self.updated_by.pk
+
+
+def archive_age():
+    return timedelta(days=30 * getattr(settings, 'STATUS_HISTORY_ARCHIVE_MONTHS', 6))
+
+
+def pack(updates):
+    """Compress (created_at, old_status, new_status, notes, updated_by_id) tuples, oldest first"""
+    entries, previous = [], 0
+    for created_at, old_status, new_status, notes, updated_by_id in updates:
+        timestamp = round(created_at.timestamp())
+        entries.append([
+            timestamp - previous, STATUS_CODES.index(old_status), STATUS_CODES.index(new_status), notes, updated_by_id,
+        ])
+        previous = timestamp
+    compressor = zlib.compressobj(9, zdict=ZDICT)
+    body = compressor.compress(json.dumps(entries, separators=(',', ':')).encode()) + compressor.flush()
+    return bytes([FORMAT_VERSION]) + body
+
+
+def unpack(data):
+    """Inverse of pack()"""
+    data = bytes(data)
+    if data[0] != FORMAT_VERSION:
+        raise ValueError(f'Unknown status archive format {data[0]}')
+    decompressor = zlib.decompressobj(zdict=ZDICT)
+    entries = json.loads(decompressor.decompress(data[1:]) + decompressor.flush())
+    updates, timestamp = [], 0
+    for delta, old_status, new_status, notes, updated_by_id in entries:
+        timestamp += delta
+        created_at = datetime.fromtimestamp(timestamp, tz=dt_timezone.utc)
+        updates.append((created_at, STATUS_CODES[old_status], STATUS_CODES[new_status], notes, updated_by_id))
+    return updates
+
+
+def archived_updates(archive, users=None):
+    """ArchivedUpdate objects of one archive, oldest first.
+
+    ``users`` maps user ids to usernames; when omitted they are looked up.
+    """
+    updates = unpack(archive.data)
+    if users is None:
+        from users.models import User
+
+        users = dict(User.objects.filter(pk__in={update[4] for update in updates}).values_list('pk', 'username'))
+    return [
+        ArchivedUpdate(
+            created_at=created_at,
+            old_status=old_status,
+            new_status=new_status,
+            notes=notes,
+            updated_by=SimpleNamespace(pk=updated_by_id, username=users.get(updated_by_id, '')),
+        )
+        for created_at, old_status, new_status, notes, updated_by_id in updates
+    ]
+
+
+def archived_notes(data):
+    """Notes of every update in one archive blob, oldest first, joined for the search index"""
+    return ' '.join(update[3] for update in unpack(data))
+
+
+def full_history(complaint):
+    """Archived and current status updates of a complaint, newest first"""
+    updates = list(complaint.status_updates.select_related('updated_by'))
+    archive = StatusHistoryArchive.objects.filter(complaint=complaint).first()
+    if archive is not None:
+        updates += archived_updates(archive)
+    return sorted(updates, key=lambda update: update.created_at, reverse=True)
+
+
+def archivable(older_than=None):
+    """Closed complaints untouched for ``older_than`` that still have rows in StatusUpdate"""
+    cutoff = timezone.now() - (older_than or archive_age())
+    return Complaint.objects.filter(
+        status__in=CLOSED_STATUSES, updated_at__lt=cutoff, status_updates__isnull=False,
+    ).order_by().values_list('pk', flat=True).distinct()
+
+
+def archive_history(older_than=None, batch_size=DEFAULT_BATCH_SIZE, on_batch=None):
+    """Move the status updates of long-closed complaints into per-complaint archives.
+
+    Each batch is its own transaction, so the job can be stopped and rerun.
+    Returns (complaints, updates) archived.
+    """
+    complaints = updates = 0
+    while True:
+        batch = list(archivable(older_than)[:batch_size])
+        if not batch:
+            break
+        updates += archive_complaints(batch)
+        complaints += len(batch)
+        if on_batch:
+            on_batch(complaints, updates)
+    return complaints, updates
+
+
+def archive_complaints(complaint_ids):
+    """Archive every current status update of the given complaints; returns how many were moved"""
+    with transaction.atomic():
+        rows = list(
+            StatusUpdate.objects.filter(complaint_id__in=complaint_ids)
+            .select_for_update().order_by('complaint_id', 'created_at', 'pk')
+            .values_list('pk', 'complaint_id', *ENTRY_FIELDS)
+        )
+        by_complaint = {}
+        for pk, complaint_id, *update in rows:
+            by_complaint.setdefault(complaint_id, []).append(update)
+
+        # Complaints archived before keep their older entries
+        existing = StatusHistoryArchive.objects.in_bulk(by_complaint, field_name='complaint_id')
+        archives = []
+        for complaint_id, entries in by_complaint.items():
+            archive = existing.get(complaint_id) or StatusHistoryArchive(complaint_id=complaint_id)
+            if archive.pk:
+                entries = unpack(archive.data) + entries
+            archive.data = pack(entries)
+            archive.update_count = len(entries)
+            archive.last_update_at = entries[-1][0]
+            archive.archived_at = timezone.now()
+            archives.append(archive)
+
+        StatusHistoryArchive.objects.bulk_create([archive for archive in archives if not archive.pk])
+        StatusHistoryArchive.objects.bulk_update(
+            [archive for archive in archives if archive.pk and archive.complaint_id in existing],
+            ['data', 'update_count', 'last_update_at', 'archived_at'],
+        )
+        # A plain DELETE: the per-row delete signals would reindex each complaint's search notes
+        delete_rows(StatusUpdate, [row[0] for row in rows])
+    return len(rows)
+
+
+def delete_rows(model, pks):
+    """Delete rows by primary key without loading them or sending delete signals"""
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(model._meta.pk.column)
+    with connection.cursor() as cursor:
+        for start in range(0, len(pks), DEFAULT_BATCH_SIZE):
+            batch = pks[start:start + DEFAULT_BATCH_SIZE]
+            placeholders = ', '.join(['%s'] * len(batch))
+            cursor.execute(f"DELETE FROM {table} WHERE {column} IN ({placeholders})", batch)
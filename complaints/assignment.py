@@ -0,0 +1,193 @@
+import heapq
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from . import events
+from .cache import PUBLIC_DASHBOARD, invalidate
+from .models import AssignmentProfile, Complaint
+from .performance import TRACKED_FIELDS, apply_change
+
+# Workload an open complaint adds to its assignee, by priority
+PRIORITY_WEIGHTS = {'critical': 4, 'high': 3, 'medium': 2, 'low': 1}
+
+CATEGORIES = [value for value, label in Complaint.CATEGORY_CHOICES]
+
+# Capacity of staff without an AssignmentProfile
+DEFAULT_MAX_OPEN = AssignmentProfile._meta.get_field('max_open').default
+
+
+@dataclass
+class StaffLoad:
+    staff_id: int
+    username: str
+    categories: list
+    areas: list
+    max_open: int
+    load: int = 0
+    open_count: int = 0
+    version: int = field(default=0, compare=False)
+
+    @property
+    def has_capacity(self):
+        return self.open_count < self.max_open
+
+
+class AssignmentEngine:
+    """Least-loaded routing of complaints to eligible staff.
+
+    Staff sit in one heap per (category, area) they can take, ordered by
+    weighted open workload. A decision peeks at one heap; a staff member's
+    changed load is pushed as a new entry and outdated entries are dropped
+    when they surface, so each decision costs O(log staff).
+    """
+
+    def __init__(self, staff):
+        self.staff = {member.staff_id: member for member in staff}
+        self.areas = sorted({area.lower() for member in staff for area in member.areas})
+        self.heaps = {}
+        self._order = itertools.count()
+        for member in staff:
+            self._push(member)
+
+    @classmethod
+    def load(cls):
+        """Build an engine from current staff profiles and open workloads (two queries)"""
+        from users.models import User
+
+        staff = []
+        for user in User.objects.filter(role='staff', is_active=True).select_related('assignment_profile'):
+            profile = getattr(user, 'assignment_profile', None)
+            if profile is not None and not profile.auto_assign:
+                continue
+            staff.append(StaffLoad(
+                staff_id=user.pk,
+                username=user.username,
+                categories=profile.categories if profile else [],
+                areas=profile.areas if profile else [],
+                max_open=profile.max_open if profile else DEFAULT_MAX_OPEN,
+            ))
+
+        by_id = {member.staff_id: member for member in staff}
+        workloads = (
+            Complaint.objects.open().filter(assigned_to_id__in=by_id)
+            .order_by().values('assigned_to_id', 'priority').annotate(count=Count('id'))
+        )
+        for row in workloads:
+            member = by_id[row['assigned_to_id']]
+            member.open_count += row['count']
+            member.load += row['count'] * PRIORITY_WEIGHTS.get(row['priority'], 1)
+        return cls(staff)
+
+    def _keys(self, member):
+        categories = member.categories or CATEGORIES
+        # Staff without an area restriction also take complaints outside every known area
+        areas = [area.lower() for area in member.areas] or [*self.areas, None]
+        return itertools.product(categories, areas)
+
+    def _push(self, member):
+        if not member.has_capacity:
+            return
+        entry = (member.load, member.open_count, next(self._order), member.staff_id, member.version)
+        for key in self._keys(member):
+            heapq.heappush(self.heaps.setdefault(key, []), entry)
+
+    def area_of(self, address):
+        address = (address or '').lower()
+        return next((area for area in self.areas if area in address), None)
+
+    def choose(self, complaint):
+        """Least-loaded eligible staff member for a complaint, or None"""
+        heap = self.heaps.get((complaint.category, self.area_of(complaint.address)))
+        while heap:
+            load, open_count, order, staff_id, version = heap[0]
+            member = self.staff[staff_id]
+            if version == member.version and member.has_capacity:
+                return member
+            heapq.heappop(heap)
+        return None
+
+    def record(self, member, complaint):
+        """Account for a complaint just assigned to ``member``"""
+        member.load += PRIORITY_WEIGHTS.get(complaint.priority, 1)
+        member.open_count += 1
+        member.version += 1
+        self._push(member)
+
+
+class SharedEngine:
+    """A process-wide engine for routing submissions one at a time.
+
+    It is loaded once and then kept current with its own assignments.
+    Changes made elsewhere (manual assignment, resolutions, other processes)
+    are picked up when it reloads after AUTO_ASSIGN_ENGINE_TTL seconds, or
+    sooner when staff or their profiles change.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._engine = None
+        self._loaded_at = 0.0
+
+    def get(self):
+        ttl = getattr(settings, 'AUTO_ASSIGN_ENGINE_TTL', 60)
+        if self._engine is None or time.monotonic() - self._loaded_at > ttl:
+            self._engine = AssignmentEngine.load()
+            self._loaded_at = time.monotonic()
+        return self._engine
+
+    def invalidate(self):
+        self._engine = None
+
+
+shared_engine = SharedEngine()
+
+
+def assign_submitted(pk):
+    """Route one new submission with the shared engine, without reloading all staff"""
+    with shared_engine.lock:
+        return assign_unassigned([pk], engine=shared_engine.get())
+
+
+def assign_unassigned(complaint_ids=None, limit=None, engine=None):
+    """Route unassigned complaints, most urgent first; returns [(complaint_id, username)].
+
+    Each assignment is a conditional UPDATE that only succeeds while the
+    complaint is still unassigned, so it never overrides a concurrent
+    self-assignment or another engine run.
+    """
+    if engine is None:
+        engine = AssignmentEngine.load()
+    complaints = Complaint.objects.unassigned().order_by('sla_deadline', 'created_at')
+    if complaint_ids is not None:
+        complaints = complaints.filter(pk__in=complaint_ids)
+    complaints = complaints.only('complaint_id', 'category', 'priority', 'address', *TRACKED_FIELDS)
+    if limit:
+        complaints = complaints[:limit]
+
+    assigned = []
+    for complaint in complaints.iterator(chunk_size=500):
+        member = engine.choose(complaint)
+        if member is None:
+            continue
+        with transaction.atomic():
+            claimed = Complaint.objects.filter(pk=complaint.pk, assigned_to__isnull=True, status='submitted').update(
+                assigned_to_id=member.staff_id, updated_at=timezone.now()
+            )
+            if claimed:
+                # .update() skips save(), so move the complaint between rollups here
+                old_state = {name: getattr(complaint, name) for name in TRACKED_FIELDS}
+                apply_change(old_state, {**old_state, 'assigned_to_id': member.staff_id})
+        if claimed:
+            engine.record(member, complaint)
+            complaint.assigned_to_id = member.staff_id
+            events.publish(events.complaint_event('updated', complaint))
+            assigned.append((complaint.complaint_id, member.username))
+
+    if assigned:
+        invalidate(PUBLIC_DASHBOARD)
+    return assigned
@@ -0,0 +1,59 @@
+import re
+from django.db import connection
+from .filters import filter_complaints
+from .models import Complaint
+from .pagination import DEFAULT_PAGE_SIZE, page_query
+
+# Plan fragments that mean a query fell back to scanning or sorting the table.
+# Listings may walk an index in order (they stop at LIMIT); counts may not scan at all.
+FULL_SCAN_PATTERNS = {
+    'sqlite': [r'SCAN complaints_complaint(?! USING)', r'USE TEMP B-TREE FOR ORDER BY'],
+    'postgresql': [r'Seq Scan on complaints_complaint', r'Sort Key'],
+    'mysql': [r'\btype\W+ALL\b', r'Using filesort'],
+}
+INDEX_SCAN_PATTERNS = {
+    'sqlite': [r'SCAN complaints_complaint'],
+    'postgresql': [r'Seq Scan on complaints_complaint'],
+    'mysql': [r'\btype\W+(ALL|index)\b'],
+}
+
+
+def hot_queries(staff, customer):
+    """The listings and counts behind the complaint views, as (queryset, is_listing) by name.
+
+    Querysets are built with the views' own presets, filters and pagination,
+    so the plans checked are those of the SQL the views run.
+    """
+    def first_page(queryset, size=DEFAULT_PAGE_SIZE, **filters):
+        queryset, _ = filter_complaints(queryset, filters)
+        return page_query(queryset, size), True
+
+    table = Complaint.objects.for_table().order_by('-created_at')
+    assigned = Complaint.objects.for_cards().filter(assigned_to=staff).order_by('-created_at')
+    return {
+        'all_complaints': first_page(table),
+        'status_listing': first_page(table, status='in_progress'),
+        'category_listing': first_page(table, category='leak'),
+        'priority_listing': first_page(table, priority='critical'),
+        'manager_dashboard': first_page(table, size=10),
+        'overdue_alerts': (Complaint.objects.for_table().overdue().order_by('sla_deadline')[:5], True),
+        'my_complaints': first_page(Complaint.objects.for_cards().filter(customer=customer).order_by('-created_at')),
+        'staff_assigned': first_page(assigned),
+        'staff_counts': (assigned.order_by().values('id'), False),
+        'unassigned_preview': (Complaint.objects.unassigned().for_table().order_by('-created_at')[:5], True),
+        'unassigned_queue': first_page(Complaint.objects.unassigned().for_cards().order_by('-created_at')),
+    }
+
+
+def explain(queryset):
+    """Return the database's query plan for a queryset"""
+    return queryset.explain()
+
+
+def find_regressions(plan, is_listing=True, vendor=None):
+    """Return the plan fragments that indicate a full scan or sort"""
+    vendor = vendor or connection.vendor
+    patterns = list(FULL_SCAN_PATTERNS.get(vendor, []))
+    if not is_listing:
+        patterns += INDEX_SCAN_PATTERNS.get(vendor, [])
+    return [pattern for pattern in patterns if re.search(pattern, plan, re.MULTILINE)]
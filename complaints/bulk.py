@@ -0,0 +1,116 @@
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from . import dedup, events, search, trends
+from .cache import PUBLIC_DASHBOARD, invalidate
+from .models import Complaint, StatusUpdate
+from .performance import rebuild
+from .sla import deadline_expression
+from .stats import CLOSED_STATUSES
+
+# Largest selection a single bulk request may change
+MAX_BULK_COMPLAINTS = 500
+
+
+def editable_complaints(user, complaint_ids, action):
+    """Selected complaints the user may change, with the rules of the single-complaint views"""
+    complaints = Complaint.objects.filter(complaint_id__in=complaint_ids[:MAX_BULK_COMPLAINTS])
+    if user.is_manager():
+        return complaints
+    if user.is_staff_member():
+        if action == 'assign':
+            # Staff can only pick up complaints nobody has yet
+            return complaints.filter(assigned_to__isnull=True)
+        return complaints.filter(assigned_to=user)
+    return complaints.none()
+
+
+def bulk_assign(user, complaint_ids, assigned_to=None, priority=None):
+    """Assign and/or reprioritise the selected complaints; returns how many changed.
+
+    Staff always assign to themselves, which also moves the complaints to
+    in progress and records a status update, like the self-assign button.
+    """
+    self_assign = user.is_staff_member()
+    if self_assign:
+        assigned_to, priority = user, None
+
+    now = timezone.now()
+    changes = {'updated_at': now}
+    if assigned_to is not None:
+        changes['assigned_to'] = assigned_to
+    if priority:
+        changes['priority'] = priority
+        changes['sla_deadline'] = deadline_expression(Complaint, priority)
+    if self_assign:
+        changes['status'] = 'in_progress'
+
+    with transaction.atomic():
+        rows = _lock(editable_complaints(user, complaint_ids, 'assign'))
+        if not rows:
+            return 0
+        Complaint.objects.filter(pk__in=rows).update(**changes)
+
+        history = []
+        if self_assign:
+            history = [
+                StatusUpdate(
+                    complaint_id=pk, updated_by=user, old_status=status, new_status='in_progress',
+                    notes=f'Complaint assigned to {user.username}', created_at=now,
+                )
+                for pk, (status, _) in rows.items()
+            ]
+        staff_ids = {assignee for _, assignee in rows.values()} | {getattr(assigned_to, 'pk', None)}
+        _sync_derived(rows, history, staff_ids)
+    return len(rows)
+
+
+def bulk_update_status(user, complaint_ids, new_status, notes):
+    """Move the selected complaints to ``new_status`` with one status update each; returns how many changed"""
+    now = timezone.now()
+    changes = {'status': new_status, 'updated_at': now}
+    if new_status == 'resolved':
+        changes['resolved_at'] = Coalesce(F('resolved_at'), Value(now))
+
+    with transaction.atomic():
+        rows = _lock(editable_complaints(user, complaint_ids, 'status'))
+        if not rows:
+            return 0
+        Complaint.objects.filter(pk__in=rows).update(**changes)
+
+        history = [
+            StatusUpdate(
+                complaint_id=pk, updated_by=user, old_status=status, new_status=new_status,
+                notes=notes, created_at=now,
+            )
+            for pk, (status, _) in rows.items()
+        ]
+        if new_status in CLOSED_STATUSES:
+            dedup.forget_complaints([pk for pk, (status, _) in rows.items() if status not in CLOSED_STATUSES])
+        _sync_derived(rows, history, {assignee for _, assignee in rows.values()})
+    return len(rows)
+
+
+def _lock(complaints):
+    """Lock the selected rows and return {pk: (status, assigned_to_id)} as they were"""
+    rows = complaints.select_for_update().order_by('pk').values_list('pk', 'status', 'assigned_to_id')
+    return {pk: (status, assignee) for pk, status, assignee in rows}
+
+
+def _sync_derived(rows, history, staff_ids):
+    # .update() and bulk_create() skip save() and signals, so refresh what they maintain
+    StatusUpdate.objects.bulk_create(history)
+    trends.record_updates(history)
+    staff_ids = [pk for pk in staff_ids if pk is not None]
+    if staff_ids:
+        rebuild(staff_ids)
+    if history:
+        search.index_complaints(list(rows))
+    transaction.on_commit(lambda: invalidate(PUBLIC_DASHBOARD))
+
+    changed = [
+        events.complaint_event('updated', complaint, rows[complaint.pk][1])
+        for complaint in Complaint.objects.filter(pk__in=rows).only(*events.EVENT_FIELDS)
+    ]
+    transaction.on_commit(lambda: [events.publish(event) for event in changed])
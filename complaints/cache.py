@@ -0,0 +1,74 @@
+import time
+from django.conf import settings
+from django.core.cache import cache
+
+PUBLIC_DASHBOARD = 'public_dashboard'
+
+# How long a recomputing worker holds the lock, and how long others wait for a first value
+LOCK_TIMEOUT = 30
+LOCK_WAIT = 2.0
+LOCK_POLL_INTERVAL = 0.05
+
+# Stale copies outlive their TTL so they can be served while one worker recomputes
+STALE_FACTOR = 10
+
+
+def _generation_key(namespace):
+    return f'{namespace}:generation'
+
+
+def _generation(namespace):
+    generation = cache.get(_generation_key(namespace))
+    if generation is None:
+        cache.add(_generation_key(namespace), 1, timeout=None)
+        generation = cache.get(_generation_key(namespace), 1)
+    return generation
+
+
+def invalidate(namespace):
+    """Mark every cached section in a namespace as stale"""
+    try:
+        cache.incr(_generation_key(namespace))
+    except ValueError:
+        cache.add(_generation_key(namespace), 2, timeout=None)
+
+
+def cached_section(namespace, name, compute, ttl=None):
+    """Return a cached value for one section, recomputing it at most once at a time.
+
+    A value is fresh until its TTL passes or the namespace is invalidated.
+    When it is stale, the worker that wins the lock recomputes it while the
+    others keep serving the stale copy.
+    """
+    if ttl is None:
+        ttl = getattr(settings, 'PUBLIC_DASHBOARD_CACHE_TTL', 60)
+    key = f'{namespace}:{name}'
+    lock_key = f'{key}:lock'
+    generation = _generation(namespace)
+
+    entry = cache.get(key)
+    if entry and entry['generation'] == generation and entry['expires'] > time.time():
+        return entry['value']
+
+    if not cache.add(lock_key, True, timeout=LOCK_TIMEOUT):
+        if entry:
+            return entry['value']
+        # Nothing to serve yet: give the lock holder a moment to fill the cache
+        deadline = time.monotonic() + LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            entry = cache.get(key)
+            if entry:
+                return entry['value']
+        return compute()
+
+    try:
+        value = compute()
+        cache.set(
+            key,
+            {'value': value, 'generation': generation, 'expires': time.time() + ttl},
+            timeout=ttl * STALE_FACTOR,
+        )
+    finally:
+        cache.delete(lock_key)
+    return value
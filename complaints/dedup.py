@@ -0,0 +1,193 @@
+import hashlib
+import random
+import re
+from datetime import timedelta
+from django.db.models import Count, Q
+from .geo import haversine_km
+from .models import Complaint, ComplaintFingerprint
+from .stats import CLOSED_STATUSES
+
+# MinHash signature split into LSH bands: complaints sharing any band are candidates
+BANDS = 12
+ROWS_PER_BAND = 3
+NUM_PERMUTATIONS = BANDS * ROWS_PER_BAND
+
+SHINGLE_SIZE = 4
+
+# Complaint fields the fingerprint is computed from
+FINGERPRINT_FIELDS = ['title', 'description', 'address']
+
+# Candidates must be this similar, this recent and (when both have GPS) this close
+SIMILARITY_THRESHOLD = 0.5
+DUPLICATE_WINDOW = timedelta(days=7)
+MAX_DISTANCE_KM = 3.0
+
+# Upper bound on candidates verified per submission
+MAX_CANDIDATES = 20
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20251017)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERMUTATIONS)]
+
+
+def complaint_text(title, description, address):
+    return ' '.join(re.findall(r'\w+', f'{title} {description} {address}'.lower()))
+
+
+def shingles(text):
+    """Character shingles of normalized text"""
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _hash(value):
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), 'big')
+
+
+def minhash(shingle_set):
+    """MinHash signature of a shingle set"""
+    hashes = [_hash(shingle) for shingle in shingle_set]
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def band_buckets(signature):
+    """One signed 64-bit bucket per LSH band"""
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(','.join(map(str, rows)).encode(), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'big', signed=True))
+    return buckets
+
+
+def find_duplicate(complaint, buckets, shingle_set):
+    """Return the most similar recent open complaint about the same incident, or None.
+
+    Only complaints sharing an LSH bucket are looked at, so the cost depends on
+    the number of similar reports rather than on the size of the open backlog.
+    """
+    bucket_match = Q()
+    for band, bucket in enumerate(buckets):
+        bucket_match |= Q(band=band, bucket=bucket)
+
+    candidate_ids = list(
+        ComplaintFingerprint.objects.filter(bucket_match)
+        .filter(
+            complaint__category=complaint.category,
+            complaint__status__in=['submitted', 'in_progress'],
+            complaint__created_at__gte=complaint.created_at - DUPLICATE_WINDOW,
+        )
+        .exclude(complaint_id=complaint.pk)
+        .values('complaint_id')
+        .annotate(matches=Count('id'))
+        .order_by('-matches')
+        .values_list('complaint_id', flat=True)[:MAX_CANDIDATES]
+    )
+    if not candidate_ids:
+        return None
+
+    best, best_score = None, SIMILARITY_THRESHOLD
+    candidates = Complaint.objects.filter(pk__in=candidate_ids).only(
+        'complaint_id', 'title', 'description', 'address', 'latitude', 'longitude', 'parent_id'
+    )
+    for candidate in candidates:
+        if None not in (complaint.latitude, candidate.latitude):
+            distance = haversine_km(complaint.latitude, complaint.longitude, candidate.latitude, candidate.longitude)
+            if distance > MAX_DISTANCE_KM:
+                continue
+        score = jaccard(shingle_set, shingles(complaint_text(candidate.title, candidate.description, candidate.address)))
+        if score >= best_score:
+            best, best_score = candidate, score
+    return best
+
+
+def register_complaint(complaint):
+    """Link a new complaint to the incident it duplicates and index its fingerprint.
+
+    Returns the parent complaint, or None when the complaint looks new.
+    """
+    shingle_set = shingles(complaint_text(complaint.title, complaint.description, complaint.address))
+    buckets = band_buckets(minhash(shingle_set)) if shingle_set else []
+
+    parent = find_duplicate(complaint, buckets, shingle_set) if buckets else None
+    if parent is not None:
+        # Always point at the first report of the incident
+        parent_id = parent.parent_id or parent.pk
+        Complaint.objects.filter(pk=complaint.pk).update(parent_id=parent_id)
+        complaint.parent_id = parent_id
+
+    ComplaintFingerprint.objects.bulk_create(
+        [ComplaintFingerprint(complaint=complaint, band=band, bucket=bucket) for band, bucket in enumerate(buckets)]
+    )
+    return parent
+
+
+def update_fingerprints(complaint, previous, update_fields=None):
+    """Keep a saved complaint's fingerprints in line with its text and status.
+
+    ``previous`` holds the stored values from before the save. Fingerprints are
+    dropped when the complaint moves to a closed status and recomputed when its
+    text changes or it is reopened; other saves leave them alone.
+    """
+    if previous is None:
+        was_open, changed = False, True
+    else:
+        was_open = previous['status'] not in CLOSED_STATUSES
+        # Deferred fields were not loaded, so they cannot have been changed
+        saved = set(FINGERPRINT_FIELDS if update_fields is None else update_fields) - complaint.get_deferred_fields()
+        changed = any(previous[field] != getattr(complaint, field) for field in FINGERPRINT_FIELDS if field in saved)
+
+    if complaint.status in CLOSED_STATUSES:
+        if was_open or previous is None:
+            forget_complaint(complaint.pk)
+        return
+    if was_open and not changed:
+        return
+    forget_complaint(complaint.pk)
+    ComplaintFingerprint.objects.bulk_create(fingerprints(complaint))
+
+
+def forget_complaint(complaint_id):
+    """Drop fingerprints of a complaint that can no longer collect duplicates"""
+    ComplaintFingerprint.objects.filter(complaint_id=complaint_id).delete()
+
+
+def forget_complaints(complaint_ids):
+    ComplaintFingerprint.objects.filter(complaint_id__in=complaint_ids).delete()
+
+
+def fingerprints(complaint):
+    """Fingerprint rows for a complaint, without looking for duplicates"""
+    shingle_set = shingles(complaint_text(complaint.title, complaint.description, complaint.address))
+    if not shingle_set:
+        return []
+    return [
+        ComplaintFingerprint(complaint_id=complaint.pk, band=band, bucket=bucket)
+        for band, bucket in enumerate(band_buckets(minhash(shingle_set)))
+    ]
+
+
+def rebuild_fingerprints():
+    """Re-fingerprint every open complaint without relinking; returns the number indexed"""
+    ComplaintFingerprint.objects.all().delete()
+    count = 0
+    batch = []
+    open_complaints = Complaint.objects.open().only('title', 'description', 'address').iterator(chunk_size=2000)
+    for complaint in open_complaints:
+        rows = fingerprints(complaint)
+        if not rows:
+            continue
+        batch.extend(rows)
+        count += 1
+        if len(batch) >= 5000:
+            ComplaintFingerprint.objects.bulk_create(batch)
+            batch = []
+    ComplaintFingerprint.objects.bulk_create(batch)
+    return count
@@ -0,0 +1,185 @@
+import asyncio
+import json
+import threading
+from datetime import timedelta
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils import timezone
+from .models import LiveEvent
+
+# Events a slow subscriber may fall behind before it is told to resync
+QUEUE_SIZE = 100
+
+# Comment line sent on idle streams so proxies keep the connection open
+KEEPALIVE_SECONDS = 15
+
+# Database broker polling and retention
+POLL_INTERVAL = 1.0
+EVENT_RETENTION = timedelta(minutes=10)
+PRUNE_EVERY = 60
+
+
+# Complaint fields carried by an event
+EVENT_FIELDS = ['complaint_id', 'title', 'category', 'priority', 'status', 'assigned_to_id']
+
+
+def complaint_event(kind, complaint, previous_assigned_to_id=None):
+    """Event payload describing a complaint after a change.
+
+    ``previous_assigned_to_id`` names the staff member a reassignment took the complaint from.
+    """
+    if previous_assigned_to_id == complaint.assigned_to_id:
+        previous_assigned_to_id = None
+    return {
+        'kind': kind,
+        **{field: getattr(complaint, field) for field in EVENT_FIELDS},
+        'previous_assigned_to_id': previous_assigned_to_id,
+    }
+
+
+def visible_to(user, event):
+    """Managers see every event; staff see new work, their own complaints and ones taken from them"""
+    if user.is_manager():
+        return True
+    return event['assigned_to_id'] in (None, user.pk) or event.get('previous_assigned_to_id') == user.pk
+
+
+def format_sse(event):
+    return f"event: {event['kind']}\ndata: {json.dumps(event)}\n\n"
+
+
+class Subscription:
+    """One open stream's queue, filled from any thread"""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.overflowed = False
+
+    def deliver(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The stream's event loop has already shut down
+            pass
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class LocalBroker:
+    """Fans events out to the streams open in this process"""
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def publish(self, event):
+        self.fan_out(event)
+
+    def fan_out(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+    async def subscribe(self):
+        subscription = Subscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+
+class DatabaseBroker(LocalBroker):
+    """Shares events between worker processes through the LiveEvent table.
+
+    A stand-in for a pub/sub server: each process runs one poller, however
+    many streams it serves, and fans new rows out locally.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._poller = None
+
+    def publish(self, event):
+        LiveEvent.objects.create(kind=event['kind'], payload=event)
+
+    async def subscribe(self):
+        subscription = await super().subscribe()
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll())
+        return subscription
+
+    async def _poll(self):
+        last_id = await sync_to_async(self._latest_id)()
+        last_prune = 0.0
+        loop = asyncio.get_running_loop()
+        while self._subscribers:
+            for row in await sync_to_async(self._events_after)(last_id):
+                last_id = row.pk
+                self.fan_out(row.payload)
+            if loop.time() - last_prune > PRUNE_EVERY:
+                await sync_to_async(self._prune)()
+                last_prune = loop.time()
+            await asyncio.sleep(POLL_INTERVAL)
+
+    @staticmethod
+    def _latest_id():
+        return LiveEvent.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+
+    @staticmethod
+    def _events_after(last_id):
+        return list(LiveEvent.objects.filter(pk__gt=last_id).order_by('pk')[:500])
+
+    @staticmethod
+    def _prune():
+        LiveEvent.objects.filter(created_at__lt=timezone.now() - EVENT_RETENTION).delete()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            kind = getattr(settings, 'LIVE_UPDATES_BROKER', 'local')
+            _broker = DatabaseBroker() if kind == 'database' else LocalBroker()
+    return _broker
+
+
+def publish(event):
+    get_broker().publish(event)
+
+
+async def stream(user):
+    """Yield server-sent events visible to ``user`` until the client disconnects"""
+    broker = get_broker()
+    subscription = await broker.subscribe()
+    try:
+        yield f'retry: {KEEPALIVE_SECONDS * 1000}\n\n'
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            if subscription.overflowed:
+                # Events were dropped; the client reloads instead of trusting partial data
+                subscription.overflowed = False
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                yield format_sse({'kind': 'resync'})
+                continue
+            if visible_to(user, event):
+                yield format_sse(event)
+    finally:
+        broker.unsubscribe(subscription)
@@ -0,0 +1,64 @@
+import csv
+from itertools import islice
+from asgiref.sync import sync_to_async
+
+# Column key -> (header, value getter), in export order
+EXPORT_COLUMNS = {
+    'complaint_id': ('Complaint ID', lambda c: c.complaint_id),
+    'title': ('Title', lambda c: c.title),
+    'category': ('Category', lambda c: c.get_category_display()),
+    'priority': ('Priority', lambda c: c.get_priority_display()),
+    'status': ('Status', lambda c: c.get_status_display()),
+    'customer': ('Customer', lambda c: c.customer.username),
+    'assigned_to': ('Assigned To', lambda c: c.assigned_to.username if c.assigned_to else 'Unassigned'),
+    'address': ('Address', lambda c: c.address),
+    'created_at': ('Created At', lambda c: c.created_at.strftime('%Y-%m-%d %H:%M')),
+    'resolved_at': ('Resolved At', lambda c: c.resolved_at.strftime('%Y-%m-%d %H:%M') if c.resolved_at else 'N/A'),
+    'response_time': ('Response Time (hrs)', lambda c: c.response_time if c.response_time else 'N/A'),
+    'rating': ('Rating', lambda c: c.customer_rating if c.customer_rating else 'N/A'),
+}
+
+# Rows fetched from the database per round trip
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """File-like object whose write() returns the value instead of buffering it"""
+
+    def write(self, value):
+        return value
+
+
+def parse_columns(values):
+    """Return the requested column keys in export order, or all columns if none are valid.
+
+    Accepts repeated ``columns`` parameters and comma-separated lists.
+    """
+    requested = {key.strip() for value in values for key in value.split(',')}
+    columns = [key for key in EXPORT_COLUMNS if key in requested]
+    return columns or list(EXPORT_COLUMNS)
+
+
+def csv_rows(complaints, columns):
+    """Yield CSV lines for the header and each complaint, fetching rows in chunks"""
+    writer = csv.writer(Echo())
+    getters = [EXPORT_COLUMNS[key][1] for key in columns]
+    
+    yield writer.writerow([EXPORT_COLUMNS[key][0] for key in columns])
+    for complaint in complaints.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield writer.writerow([getter(complaint) for getter in getters])
+
+
+async def acsv_rows(complaints, columns):
+    """csv_rows() for ASGI responses; each chunk of rows is read in a worker thread.
+
+    Without this, Django would collect a sync iterator into one list before sending it.
+    """
+    rows = csv_rows(complaints, columns)
+    next_chunk = sync_to_async(lambda: list(islice(rows, EXPORT_CHUNK_SIZE)))
+    try:
+        while chunk := await next_chunk():
+            for line in chunk:
+                yield line
+    finally:
+        await sync_to_async(rows.close)()
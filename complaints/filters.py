@@ -0,0 +1,50 @@
+from datetime import datetime, time, timedelta
+from django.utils import timezone
+
+
+def parse_date(value):
+    """Parse a YYYY-MM-DD query parameter, returning None when missing or invalid"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+
+def filter_complaints(complaints, params):
+    """Apply the status/category/priority/assigned/date filters from a query dict.
+
+    Returns the filtered queryset and the filter values for the template.
+    """
+    status = params.get('status')
+    category = params.get('category')
+    priority = params.get('priority')
+    assigned = params.get('assigned')
+    date_from = parse_date(params.get('date_from'))
+    date_to = parse_date(params.get('date_to'))
+    
+    if status:
+        complaints = complaints.filter(status=status)
+    if category:
+        complaints = complaints.filter(category=category)
+    if priority:
+        complaints = complaints.filter(priority=priority)
+    if assigned == 'yes':
+        complaints = complaints.filter(assigned_to__isnull=False)
+    elif assigned == 'no':
+        complaints = complaints.filter(assigned_to__isnull=True)
+    if date_from:
+        complaints = complaints.filter(created_at__gte=timezone.make_aware(datetime.combine(date_from, time.min)))
+    if date_to:
+        complaints = complaints.filter(created_at__lt=timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min)))
+    
+    filters = {
+        'status_filter': status,
+        'category_filter': category,
+        'priority_filter': priority,
+        'assigned_filter': assigned,
+        'date_from': date_from,
+        'date_to': date_to,
+    }
+    return complaints, filters
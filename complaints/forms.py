@@ -2,9 +2,19 @@ from django import forms
 from .models import Complaint, StatusUpdate
 
 class ComplaintForm(forms.ModelForm):
+    # Stored as an ImageUpload and processed in the background, not saved on the complaint
+    image = forms.ImageField(
+        required=False,
+        label='Upload Image (Optional)',
+        widget=forms.FileInput(attrs={
+            'class': 'w-full px-4 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent',
+            'accept': 'image/*'
+        })
+    )
+    
     class Meta:
         model = Complaint
-        fields = ['category', 'title', 'description', 'address', 'gps_coordinates', 'image']
+        fields = ['category', 'title', 'description', 'address', 'gps_coordinates']
         widgets = {
             'category': forms.Select(attrs={
                 'class': 'w-full px-4 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent'
@@ -26,9 +36,6 @@ class ComplaintForm(forms.ModelForm):
             'gps_coordinates': forms.TextInput(attrs={
                 'class': 'w-full px-4 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent',
                 'placeholder': 'Optional: GPS coordinates'
-            }),
-            'image': forms.FileInput(attrs={
-                'class': 'w-full px-4 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent'
             })
         }
         labels = {
@@ -36,8 +43,7 @@ class ComplaintForm(forms.ModelForm):
             'title': 'Title',
             'description': 'Description',
             'address': 'Location/Address',
-            'gps_coordinates': 'GPS Coordinates (Optional)',
-            'image': 'Upload Image (Optional)'
+            'gps_coordinates': 'GPS Coordinates (Optional)'
         }
 
 
@@ -91,4 +97,41 @@ class ComplaintAssignmentForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
         # Only show staff members in the assigned_to dropdown
         from users.models import User
-        self.fields['assigned_to'].queryset = User.objects.filter(role='staff')
\ No newline at end of file
+        self.fields['assigned_to'].queryset = User.objects.filter(role='staff')
+
+class BulkAssignmentForm(forms.Form):
+    assigned_to = forms.ModelChoiceField(
+        queryset=None,
+        required=False,
+        empty_label='Keep assignee',
+        widget=forms.Select(attrs={
+            'class': 'px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500'
+        })
+    )
+    priority = forms.ChoiceField(
+        choices=[('', 'Keep priority')] + list(Complaint.PRIORITY_CHOICES),
+        required=False,
+        widget=forms.Select(attrs={
+            'class': 'px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500'
+        })
+    )
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        from users.models import User
+        self.fields['assigned_to'].queryset = User.objects.filter(role='staff')
+
+
+class BulkStatusForm(forms.Form):
+    new_status = forms.ChoiceField(
+        choices=Complaint.STATUS_CHOICES,
+        widget=forms.Select(attrs={
+            'class': 'px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500'
+        })
+    )
+    notes = forms.CharField(
+        widget=forms.TextInput(attrs={
+            'class': 'px-3 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-blue-500',
+            'placeholder': 'Update notes'
+        })
+    )
@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Max
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+from .models import ImageUpload
+
+DEFAULT_TTL = 60 * 60 * 24
+
+# Falls back to the default cache when no 'fragments' alias is configured
+CACHE_ALIAS = 'fragments'
+
+
+def _cache():
+    return caches[CACHE_ALIAS if CACHE_ALIAS in settings.CACHES else 'default']
+
+
+def _ttl():
+    return getattr(settings, 'FRAGMENT_CACHE_TTL', DEFAULT_TTL)
+
+
+def fragment_key(template_name, complaint, *parts):
+    """Cache key of one complaint's fragment; any change to the complaint bumps updated_at and so the key.
+
+    The active timezone is part of the key because fragments contain rendered dates.
+    """
+    version = ':'.join(str(part) for part in (complaint.pk, complaint.updated_at.timestamp(), *parts))
+    return f'fragment:{template_name}:{timezone.get_current_timezone_name()}:{version}'
+
+
+def card_version(complaint):
+    """Key parts of a card showing the complaint's photo, which is processed after the complaint is saved"""
+    try:
+        return (complaint.image_upload.asset_id,)
+    except ImageUpload.DoesNotExist:
+        return (None,)
+
+
+def render_rows(template_name, complaints, version=None):
+    """Rendered HTML of each complaint's row, in order.
+
+    Cached rows of the whole page come from one get_many, and the rows that
+    were missing are rendered and stored with one set_many. The overdue flag is
+    part of the key since it changes with time alone; ``version`` adds further
+    parts for rows showing data that changes without the complaint.
+    """
+    complaints = list(complaints)
+    keys = [
+        fragment_key(template_name, complaint, complaint.is_overdue, *(version(complaint) if version else ()))
+        for complaint in complaints
+    ]
+    cached = _cache().get_many(keys)
+
+    rows, missing = [], {}
+    for key, complaint in zip(keys, complaints):
+        html = cached.get(key)
+        if html is None:
+            html = missing[key] = render_to_string(template_name, {'complaint': complaint})
+        rows.append(mark_safe(html))
+    if missing:
+        _cache().set_many(missing, timeout=_ttl())
+    return rows
+
+
+def render_timeline(complaint, updates, archived_count=0, show_archived=False):
+    """Rendered status timeline of a complaint, keyed on its latest status update.
+
+    ``updates`` is only evaluated when the timeline is not cached.
+    """
+    latest = complaint.status_updates.aggregate(count=Count('id'), latest=Max('id'))
+    key = fragment_key(
+        'complaints/_status_timeline.html', complaint,
+        latest['latest'], latest['count'], archived_count if show_archived else 0,
+    )
+    html = _cache().get(key)
+    if html is None:
+        html = render_to_string('complaints/_status_timeline.html', {'complaint': complaint, 'status_updates': updates})
+        _cache().set(key, html, timeout=_ttl())
+    return mark_safe(html)
@@ -0,0 +1,165 @@
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import BytesIO
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+from .models import Complaint, ImageAsset, ImageUpload
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_FORMATS = {'JPEG', 'PNG', 'WEBP', 'GIF'}
+
+# Larger sources are rejected before decoding
+MAX_SOURCE_PIXELS = 40_000_000
+
+# Longest edge of the stored image and of each rendition
+IMAGE_MAX_DIMENSION = 1600
+RENDITIONS = {
+    'detail_thumbnail': 800,
+    'list_thumbnail': 240,
+}
+JPEG_QUALITY = 85
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def queue_image(complaint, upload):
+    """Store an uploaded file for a complaint and process it once the request commits"""
+    image_upload = ImageUpload.objects.create(complaint=complaint, original=upload)
+    transaction.on_commit(lambda: enqueue(image_upload.pk))
+    return image_upload
+
+
+def enqueue(upload_id):
+    """Hand an upload to the worker pool; with no workers configured it is processed inline"""
+    if not getattr(settings, 'IMAGE_PROCESSING_WORKERS', 2):
+        process_upload(upload_id)
+        return
+    _get_executor().submit(_run, upload_id)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_PROCESSING_WORKERS,
+                thread_name_prefix='complaint-images',
+            )
+    return _executor
+
+
+def _run(upload_id):
+    try:
+        process_upload(upload_id)
+    except Exception:
+        logger.exception('Processing image upload %s failed', upload_id)
+    finally:
+        # Worker threads hold their own connection
+        connection.close()
+
+
+def process_upload(upload_id):
+    """Validate, downscale and store one pending upload; returns False if another worker has it"""
+    claimed = ImageUpload.objects.filter(pk=upload_id, status='pending').update(
+        status='processing', started_at=timezone.now()
+    )
+    if not claimed:
+        return False
+
+    upload = ImageUpload.objects.get(pk=upload_id)
+    try:
+        with upload.original.open('rb') as f:
+            data = f.read()
+        content_hash = hashlib.sha256(data).hexdigest()
+        asset = ImageAsset.objects.filter(content_hash=content_hash).first() or _create_asset(content_hash, data)
+    except (OSError, ValueError, SyntaxError, Image.DecompressionBombError) as exc:
+        upload.status = 'failed'
+        upload.error = str(exc)[:255]
+    else:
+        upload.status = 'ready'
+        upload.asset = asset
+
+    # The original may carry EXIF metadata and is never served
+    upload.original.delete(save=False)
+    upload.processed_at = timezone.now()
+    upload.save(update_fields=['original', 'status', 'asset', 'error', 'processed_at'])
+    return True
+
+
+def _create_asset(content_hash, data):
+    image = Image.open(BytesIO(data))
+    if image.format not in ALLOWED_FORMATS:
+        raise ValueError(f'Unsupported image format: {image.format}')
+    if image.width * image.height > MAX_SOURCE_PIXELS:
+        raise ValueError('Image is too large')
+
+    # Let the JPEG decoder scale down while decoding
+    image.draft('RGB', (IMAGE_MAX_DIMENSION, IMAGE_MAX_DIMENSION))
+    image = _flatten(ImageOps.exif_transpose(image))
+    image.thumbnail((IMAGE_MAX_DIMENSION, IMAGE_MAX_DIMENSION), Image.LANCZOS)
+
+    asset = ImageAsset(content_hash=content_hash, width=image.width, height=image.height)
+    asset.image.save(f'{content_hash}.jpg', _encode(image), save=False)
+    for field, size in RENDITIONS.items():
+        rendition = image.copy()
+        rendition.thumbnail((size, size), Image.LANCZOS)
+        getattr(asset, field).save(f'{content_hash}_{size}.jpg', _encode(rendition), save=False)
+
+    try:
+        with transaction.atomic():
+            asset.save()
+    except IntegrityError:
+        # Another worker stored the same content first
+        for field in ['image', *RENDITIONS]:
+            getattr(asset, field).delete(save=False)
+        asset = ImageAsset.objects.get(content_hash=content_hash)
+    return asset
+
+
+def _flatten(image):
+    """RGB copy of an image with transparency composited onto white"""
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def _encode(image):
+    # Re-encoding without exif= drops all metadata from the output
+    buffer = BytesIO()
+    image.save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return ContentFile(buffer.getvalue())
+
+
+def reset_stalled(older_than=timedelta(minutes=10)):
+    """Requeue uploads whose worker died mid-way; returns how many were reset"""
+    return ImageUpload.objects.filter(
+        status='processing', started_at__lt=timezone.now() - older_than
+    ).update(status='pending', started_at=None)
+
+
+def process_pending():
+    """Process every queued upload in this thread; returns the number processed"""
+    pending = ImageUpload.objects.filter(status='pending').order_by('created_at').values_list('pk', flat=True)
+    return sum(process_upload(upload_id) for upload_id in list(pending))
+
+
+def adopt_legacy_images():
+    """Queue photos stored directly on complaints before the pipeline existed; returns how many"""
+    legacy = Complaint.objects.exclude(image='').filter(image__isnull=False, image_upload__isnull=True)
+    uploads = [ImageUpload(complaint_id=pk, original=name) for pk, name in legacy.values_list('pk', 'image')]
+    with transaction.atomic():
+        ImageUpload.objects.bulk_create(uploads)
+        # The upload now owns the file
+        Complaint.objects.filter(pk__in=[upload.complaint_id for upload in uploads]).update(image='')
+    return len(uploads)
@@ -0,0 +1,176 @@
+import csv
+import itertools
+import json
+import time
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from . import dedup, search, trends
+from .cache import PUBLIC_DASHBOARD, invalidate
+from .forms import ComplaintForm
+from .models import Complaint, ComplaintFingerprint, ComplaintImport, ComplaintSequence
+from .sla import deadline_for
+from .stats import OPEN_STATUSES
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Columns validated with ComplaintForm's field rules; the rest are checked here.
+# The class-level fields are used directly since binding a form per row deep-copies them.
+FORM_FIELDS = {name: ComplaintForm.base_fields[name] for name in ComplaintForm._meta.fields}
+PRIORITIES = dict(Complaint.PRIORITY_CHOICES)
+STATUSES = dict(Complaint.STATUS_CHOICES)
+
+
+class RowError(ValueError):
+    pass
+
+
+def read_rows(path, fmt=None):
+    """Stream input rows as dicts from a CSV file (with a header) or a JSON-lines file"""
+    fmt = fmt or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv')
+    with open(path, newline='', encoding='utf-8') as f:
+        if fmt == 'csv':
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def import_complaints(rows, name, batch_size=DEFAULT_BATCH_SIZE, create_customers=False, on_batch=None, on_error=None):
+    """Insert complaints from an iterable of row dicts in batches of ``batch_size``.
+
+    Progress is committed with every batch under ``name``; calling this again
+    with the same name and input skips the rows already processed.
+    Returns the ComplaintImport record.
+    """
+    progress, _ = ComplaintImport.objects.get_or_create(name=name)
+    if progress.finished_at:
+        return progress
+
+    rows = itertools.islice(rows, progress.rows_processed, None)
+    customers = {}
+    started = time.monotonic()
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            break
+        _import_batch(progress, batch, customers, create_customers, on_error)
+        if on_batch:
+            on_batch(progress, time.monotonic() - started)
+
+    progress.finished_at = timezone.now()
+    progress.save(update_fields=['finished_at', 'updated_at'])
+    invalidate(PUBLIC_DASHBOARD)
+    return progress
+
+
+def _import_batch(progress, batch, customers, create_customers, on_error):
+    first_row = progress.rows_processed + 1
+    with transaction.atomic():
+        _resolve_customers({str(row.get('customer') or '').strip() for row in batch} - {''}, customers, create_customers)
+
+        complaints = []
+        for number, row in enumerate(batch, start=first_row):
+            try:
+                complaints.append(build_complaint(row, customers))
+            except RowError as exc:
+                if on_error:
+                    on_error(number, str(exc))
+
+        _assign_ids(complaints)
+        Complaint.objects.bulk_create(complaints)
+
+        # bulk_create skips save() and signals, so keep the derived tables in step here
+        search.index_complaints([complaint.pk for complaint in complaints])
+        trends.record_submissions(complaints)
+        # Only open complaints inside the duplicate window can ever be matched
+        window_start = timezone.now() - dedup.DUPLICATE_WINDOW
+        matchable = [c for c in complaints if c.status in OPEN_STATUSES and c.created_at >= window_start]
+        ComplaintFingerprint.objects.bulk_create(
+            [row for complaint in matchable for row in dedup.fingerprints(complaint)]
+        )
+
+        progress.rows_processed += len(batch)
+        progress.imported += len(complaints)
+        progress.skipped += len(batch) - len(complaints)
+        progress.save(update_fields=['rows_processed', 'imported', 'skipped', 'updated_at'])
+
+
+def _resolve_customers(usernames, customers, create_customers):
+    """Load the batch's customers into ``customers`` with one query, creating missing ones if asked"""
+    from users.models import User
+
+    # Bound the cache on very large imports
+    if len(customers) > 100_000:
+        customers.clear()
+    missing = usernames - customers.keys()
+    if not missing:
+        return
+    customers.update(User.objects.filter(username__in=missing, role='customer').in_bulk(field_name='username'))
+
+    missing -= customers.keys()
+    if missing and create_customers:
+        password = make_password(None)
+        User.objects.bulk_create(
+            [User(username=username, role='customer', password=password) for username in sorted(missing)],
+            ignore_conflicts=True,
+        )
+        # ignore_conflicts leaves primary keys unset, so read them back
+        customers.update(User.objects.filter(username__in=missing, role='customer').in_bulk(field_name='username'))
+
+
+def build_complaint(row, customers):
+    """Validate one input row and return an unsaved Complaint; raises RowError"""
+    cleaned, errors = {}, []
+    for name, field in FORM_FIELDS.items():
+        try:
+            cleaned[name] = field.clean(row.get(name) or '')
+        except ValidationError as exc:
+            errors.append(f'{name}: {" ".join(exc.messages)}')
+    if errors:
+        raise RowError('; '.join(errors))
+    complaint = Complaint(**cleaned)
+
+    username = str(row.get('customer') or '').strip()
+    if username not in customers:
+        raise RowError(f'customer: unknown customer "{username}"')
+    complaint.customer = customers[username]
+
+    complaint.priority = row.get('priority') or 'medium'
+    if complaint.priority not in PRIORITIES:
+        raise RowError(f'priority: invalid value "{complaint.priority}"')
+    complaint.status = row.get('status') or 'submitted'
+    if complaint.status not in STATUSES:
+        raise RowError(f'status: invalid value "{complaint.status}"')
+
+    complaint.created_at = _parse_datetime(row, 'created_at') or timezone.now()
+    complaint.resolved_at = _parse_datetime(row, 'resolved_at')
+    complaint.sla_deadline = deadline_for(complaint.created_at, complaint.priority, complaint.category)
+    complaint.set_location()
+    return complaint
+
+
+def _parse_datetime(row, field):
+    value = row.get(field)
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(str(value))
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise RowError(f'{field}: invalid date/time "{value}"')
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+def _assign_ids(complaints):
+    """Give every complaint an ID from one reserved block per year"""
+    by_year = {}
+    for complaint in complaints:
+        by_year.setdefault(complaint.created_at.year, []).append(complaint)
+    for year, group in by_year.items():
+        for complaint, number in zip(group, ComplaintSequence.reserve(year, len(group))):
+            complaint.complaint_id = Complaint.format_complaint_id(year, number)
@@ -0,0 +1,194 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import count
+from django.db import connection, connections
+from django.test import Client
+from django.urls import reverse
+from .models import Complaint
+from .profiling import QueryRecorder, percentile
+
+# Latency figures compared against a stored baseline
+LATENCY_FIELDS = ['p50_ms', 'p95_ms']
+
+
+@dataclass
+class Scenario:
+    """One URL driven as one role; ``path`` builds the URL from the benchmark context"""
+    name: str
+    role: str
+    path: object
+    method: str = 'get'
+    data: object = None
+    # URL names this scenario covers, for the coverage check
+    url_name: str = ''
+    params: dict = field(default_factory=dict)
+
+
+def _submission(ctx, number):
+    return {
+        'category': 'leak',
+        'title': f'Benchmark leak {number}',
+        'description': 'Water is leaking from the main pipe on the street corner.',
+        'address': ctx['area'],
+    }
+
+
+SCENARIOS = [
+    # Public
+    Scenario('public_dashboard', 'anonymous', lambda ctx: reverse('public_dashboard')),
+    # Customer
+    Scenario('submit_form', 'customer', lambda ctx: reverse('submit_complaint'), url_name='submit_complaint'),
+    Scenario('submit_complaint', 'customer', lambda ctx: reverse('submit_complaint'), method='post', data=_submission),
+    Scenario('my_complaints', 'customer', lambda ctx: reverse('my_complaints')),
+    Scenario('complaint_detail', 'customer', lambda ctx: reverse('complaint_detail', args=[ctx['own_complaint']])),
+    Scenario('complaint_status_api', 'customer',
+             lambda ctx: reverse('api_complaint_status', args=[ctx['own_complaint']]), url_name='api_complaint_status'),
+    Scenario('complaint_history_api', 'customer',
+             lambda ctx: reverse('api_complaint_history', args=[ctx['own_complaint']]), url_name='api_complaint_history'),
+    Scenario('complaint_list_api', 'customer', lambda ctx: reverse('api_complaint_list'), url_name='api_complaint_list'),
+    # Staff
+    Scenario('staff_dashboard', 'staff', lambda ctx: reverse('staff_dashboard')),
+    Scenario('unassigned_complaints', 'staff', lambda ctx: reverse('unassigned_complaints')),
+    Scenario('update_status_form', 'staff',
+             lambda ctx: reverse('update_complaint_status', args=[ctx['assigned_complaint']]), url_name='update_complaint_status'),
+    Scenario('assign_form', 'staff',
+             lambda ctx: reverse('assign_complaint', args=[ctx['assigned_complaint']]), url_name='assign_complaint'),
+    Scenario('search_complaints', 'staff', lambda ctx: reverse('search_complaints'), params={'q': 'leak'}),
+    Scenario('nearby_api', 'staff', lambda ctx: reverse('api_complaints_nearby'),
+             params={'lat': '5.6037', 'lon': '-0.1870', 'radius_km': '5'}, url_name='api_complaints_nearby'),
+    Scenario('hotspots_api', 'staff', lambda ctx: reverse('api_complaint_hotspots'), url_name='api_complaint_hotspots'),
+    # Manager
+    Scenario('manager_dashboard', 'manager', lambda ctx: reverse('manager_dashboard')),
+    Scenario('all_complaints', 'manager', lambda ctx: reverse('all_complaints')),
+    Scenario('all_complaints_filtered', 'manager', lambda ctx: reverse('all_complaints'),
+             params={'status': 'in_progress', 'category': 'leak'}, url_name='all_complaints'),
+    Scenario('staff_performance', 'manager', lambda ctx: reverse('staff_performance')),
+    Scenario('export_complaints', 'manager', lambda ctx: reverse('export_complaints')),
+    Scenario('trends_api', 'manager', lambda ctx: reverse('api_complaint_trends'),
+             params={'period': 'week'}, url_name='api_complaint_trends'),
+    Scenario('profiling_report', 'manager', lambda ctx: reverse('profiling_report')),
+]
+
+# Complaint URLs changed only through POSTs the scenarios above do not replay, and the
+# live event stream, which never ends under ASGI and is a bare 204 under the WSGI test client
+NOT_BENCHMARKED = {'bulk_assign_complaints', 'bulk_update_complaint_status', 'live_updates'}
+
+
+def build_context():
+    """Users and complaint IDs the scenarios run against, picked from the seeded data"""
+    from users.models import User
+
+    complaint = Complaint.objects.filter(status_updates__isnull=False).select_related('customer').first()
+    assigned = Complaint.objects.filter(assigned_to__isnull=False, status='in_progress').select_related('assigned_to').first()
+    return {
+        'users': {
+            'anonymous': None,
+            'customer': complaint.customer,
+            'staff': assigned.assigned_to,
+            'manager': User.objects.filter(role='manager').first(),
+        },
+        'own_complaint': complaint.complaint_id,
+        'assigned_complaint': assigned.complaint_id,
+        'area': complaint.customer.address or 'Accra Central',
+    }
+
+
+def run_scenario(scenario, ctx, requests=50, concurrency=4):
+    """Drive one scenario with ``concurrency`` clients; returns throughput, latency and query figures"""
+    numbers = count(1)
+    per_client = max(1, requests // concurrency)
+
+    # Sessions are created up front so logins do not compete with the measured requests
+    clients = []
+    for _ in range(concurrency):
+        client = Client()
+        if ctx['users'][scenario.role] is not None:
+            client.force_login(ctx['users'][scenario.role])
+        clients.append(client)
+
+    def client_run(client):
+        samples = []
+        try:
+            for _ in range(per_client):
+                recorder = QueryRecorder()
+                url = scenario.path(ctx)
+                kwargs = {'data': scenario.data(ctx, next(numbers))} if scenario.data else {'data': scenario.params}
+                started = time.perf_counter()
+                with connection.execute_wrapper(recorder):
+                    response = getattr(client, scenario.method)(url, **kwargs)
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+                samples.append(((time.perf_counter() - started) * 1000, recorder.count, response.status_code))
+        finally:
+            # Each client thread holds its own connection
+            connection.close()
+        return samples
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        samples = [sample for result in executor.map(client_run, clients) for sample in result]
+    elapsed = time.perf_counter() - started
+
+    durations = sorted(duration for duration, _, _ in samples)
+    queries = [query_count for _, query_count, _ in samples]
+    return {
+        'scenario': scenario.name,
+        'requests': len(samples),
+        'errors': sum(status >= 400 for _, _, status in samples),
+        'throughput': round(len(samples) / elapsed, 1),
+        'p50_ms': round(percentile(durations, 50), 2),
+        'p95_ms': round(percentile(durations, 95), 2),
+        'p99_ms': round(percentile(durations, 99), 2),
+        'queries': max(queries),
+    }
+
+
+def run_benchmarks(requests=50, concurrency=4, only=None, on_result=None):
+    ctx = build_context()
+    results = []
+    for scenario in SCENARIOS:
+        if only and scenario.name not in only:
+            continue
+        result = run_scenario(scenario, ctx, requests, concurrency)
+        results.append(result)
+        if on_result:
+            on_result(result)
+    connections.close_all()
+    return results
+
+
+def uncovered_urls():
+    """Complaint URL names that no scenario requests"""
+    from .urls import urlpatterns
+
+    covered = {scenario.url_name or scenario.name for scenario in SCENARIOS} | NOT_BENCHMARKED
+    return sorted({pattern.name for pattern in urlpatterns} - covered)
+
+
+def save_baseline(results, path):
+    with open(path, 'w') as f:
+        json.dump({result['scenario']: result for result in results}, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(results, baseline, tolerance=0.5):
+    """Regressions against a baseline: latency more than ``tolerance`` slower, or more queries"""
+    regressions = []
+    for result in results:
+        previous = baseline.get(result['scenario'])
+        if previous is None:
+            continue
+        for name in LATENCY_FIELDS:
+            if result[name] > previous[name] * (1 + tolerance):
+                regressions.append(f"{result['scenario']}: {name} {previous[name]} -> {result[name]}")
+        if result['queries'] > previous['queries']:
+            regressions.append(f"{result['scenario']}: queries {previous['queries']} -> {result['queries']}")
+        if result['errors'] > previous['errors']:
+            regressions.append(f"{result['scenario']}: errors {previous['errors']} -> {result['errors']}")
+    return regressions
@@ -0,0 +1,26 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from complaints.archive import DEFAULT_BATCH_SIZE, archive_history
+
+
+class Command(BaseCommand):
+    help = 'Move status updates of long-closed complaints into compressed per-complaint archives'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months', type=int, default=settings.STATUS_HISTORY_ARCHIVE_MONTHS,
+            help='Archive complaints closed and untouched for this many months',
+        )
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Complaints per transaction')
+
+    def handle(self, *args, **options):
+        def report(complaints, updates):
+            self.stdout.write(f'{complaints} complaint(s), {updates} update(s) archived')
+
+        complaints, updates = archive_history(
+            older_than=timedelta(days=30 * options['months']),
+            batch_size=options['batch_size'],
+            on_batch=report if options['verbosity'] > 1 else None,
+        )
+        self.stdout.write(self.style.SUCCESS(f'Archived {updates} status update(s) from {complaints} complaint(s).'))
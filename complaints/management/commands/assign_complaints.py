@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from complaints.assignment import assign_unassigned
+
+
+class Command(BaseCommand):
+    help = 'Assign unassigned complaints to the least-loaded eligible staff, most urgent first'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, help='Assign at most this many complaints')
+
+    def handle(self, *args, **options):
+        assigned = assign_unassigned(limit=options['limit'])
+        if options['verbosity'] > 1:
+            for complaint_id, username in assigned:
+                self.stdout.write(f'{complaint_id} -> {username}')
+        self.stdout.write(self.style.SUCCESS(f'Assigned {len(assigned)} complaint(s).'))
@@ -0,0 +1,57 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from complaints.benchmarks import explain, find_regressions, hot_queries
+from complaints.seed import seed_data
+
+
+class Command(BaseCommand):
+    help = 'Seed a throwaway test database and check that every hot complaint query uses an index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--complaints', type=int, default=20000, help='Number of complaints to seed')
+        parser.add_argument('--staff', type=int, default=20, help='Number of staff members to seed')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the generated data')
+        parser.add_argument('--show-plans', action='store_true', help='Print the full plan for every query')
+
+    def handle(self, *args, **options):
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            failures = self.run_checks(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if failures:
+            raise CommandError(f'{len(failures)} quer{"y" if len(failures) == 1 else "ies"} without index support: {", ".join(failures)}')
+        self.stdout.write(self.style.SUCCESS('All hot queries use an index.'))
+
+    def run_checks(self, options):
+        from users.models import User
+
+        start = time.perf_counter()
+        counts = seed_data(complaints=options['complaints'], staff=options['staff'], seed=options['seed'])
+        self.stdout.write(f"Seeded {counts['complaints']} complaints in {time.perf_counter() - start:.1f}s")
+
+        # Refresh planner statistics so plans reflect the seeded data
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        staff = User.objects.filter(role='staff').first()
+        customer = User.objects.filter(role='customer').first()
+
+        failures = []
+        for name, (queryset, is_listing) in hot_queries(staff, customer).items():
+            plan = explain(queryset)
+            start = time.perf_counter()
+            list(queryset)
+            elapsed = (time.perf_counter() - start) * 1000
+
+            problems = find_regressions(plan, is_listing)
+            status = self.style.ERROR('SCAN') if problems else self.style.SUCCESS('OK')
+            self.stdout.write(f'{status:>4} {name:<22} {elapsed:8.2f} ms')
+            if problems or options['show_plans']:
+                self.stdout.write('       ' + plan.replace('\n', '\n       '))
+            if problems:
+                failures.append(name)
+        return failures
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from complaints.loadtest import SCENARIOS, compare, load_baseline, run_benchmarks, save_baseline, uncovered_urls
+from complaints.seed import seed_data
+
+
+class Command(BaseCommand):
+    help = 'Seed a throwaway test database and load-test every complaints view with concurrent clients'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--complaints', type=int, default=5000, help='Number of complaints to seed')
+        parser.add_argument('--staff', type=int, default=20, help='Number of staff members to seed')
+        parser.add_argument('--customers', type=int, help='Number of customers to seed (default: complaints / 5)')
+        parser.add_argument('--days', type=int, default=365, help='Spread complaint dates over this many days')
+        parser.add_argument('--no-updates', action='store_true', help='Do not seed status update history')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the generated data')
+        parser.add_argument('--requests', type=int, default=50, help='Requests per scenario')
+        parser.add_argument('--concurrency', type=int, default=4, help='Concurrent clients per scenario')
+        parser.add_argument('--only', nargs='+', choices=[scenario.name for scenario in SCENARIOS], help='Scenarios to run')
+        parser.add_argument('--save-baseline', metavar='PATH', help='Write the results as a JSON baseline')
+        parser.add_argument('--baseline', metavar='PATH', help='Fail on regressions against this baseline')
+        parser.add_argument('--tolerance', type=float, default=0.5, help='Allowed latency increase over the baseline (0.5 = 50%%)')
+
+    def handle(self, *args, **options):
+        missing = uncovered_urls()
+        if missing:
+            self.stdout.write(self.style.WARNING(f'No scenario for: {", ".join(missing)}'))
+
+        old_name = connection.settings_dict['NAME']
+        test_settings = connection.settings_dict.setdefault('TEST', {})
+        if connection.vendor == 'sqlite' and not test_settings.get('NAME'):
+            # Concurrent clients need a file database; the shared in-memory one locks whole tables
+            test_settings['NAME'] = os.path.join(tempfile.gettempdir(), 'gwcl_benchmark.sqlite3')
+        # Lets the test client's host through ALLOWED_HOSTS
+        setup_test_environment()
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            results = self.run(options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options['save_baseline']:
+            save_baseline(results, options['save_baseline'])
+            self.stdout.write(f"Baseline written to {options['save_baseline']}")
+        if options['baseline']:
+            regressions = compare(results, load_baseline(options['baseline']), options['tolerance'])
+            if regressions:
+                raise CommandError('Regressions against the baseline:\n  ' + '\n  '.join(regressions))
+            self.stdout.write(self.style.SUCCESS('No regressions against the baseline.'))
+
+    def run(self, options):
+        start = time.perf_counter()
+        counts = seed_data(
+            complaints=options['complaints'],
+            staff=options['staff'],
+            customers=options['customers'],
+            days=options['days'],
+            updates=not options['no_updates'],
+            seed=options['seed'],
+        )
+        self.stdout.write(
+            f"Seeded {counts['complaints']} complaints and {counts['status_updates']} status updates "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+        self.stdout.write(f"{'scenario':<26}{'req/s':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}{'errors':>8}")
+
+        def report(result):
+            line = (
+                f"{result['scenario']:<26}{result['throughput']:>8}{result['p50_ms']:>10}"
+                f"{result['p95_ms']:>10}{result['p99_ms']:>10}{result['queries']:>9}{result['errors']:>8}"
+            )
+            self.stdout.write(self.style.ERROR(line) if result['errors'] else line)
+
+        return run_benchmarks(options['requests'], options['concurrency'], options['only'], on_result=report)
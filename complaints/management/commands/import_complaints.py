@@ -0,0 +1,64 @@
+import os
+from django.core.management.base import BaseCommand, CommandError
+from complaints.importer import DEFAULT_BATCH_SIZE, import_complaints, read_rows
+from complaints.models import ComplaintImport
+
+
+class Command(BaseCommand):
+    help = (
+        'Import complaints from a CSV (with header) or JSON-lines file. Columns: customer (username), '
+        'category, title, description, address, gps_coordinates and optionally priority, status, '
+        'created_at and resolved_at. Re-running with the same --name resumes an interrupted import.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Input format (default: from the file extension)')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Rows per transaction')
+        parser.add_argument('--name', help='Import name used to resume (default: the file name)')
+        parser.add_argument('--create-customers', action='store_true', help='Create customer accounts for unknown usernames')
+        parser.add_argument('--restart', action='store_true', help='Forget saved progress and start from the first row')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'No such file: {path}')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        name = options['name'] or os.path.basename(path)
+
+        if options['restart']:
+            ComplaintImport.objects.filter(name=name).delete()
+        progress = ComplaintImport.objects.filter(name=name).first()
+        if progress and progress.finished_at:
+            self.stdout.write(f'Import "{name}" already finished; use --restart to run it again.')
+            return
+        if progress:
+            self.stdout.write(f'Resuming "{name}" after row {progress.rows_processed}.')
+        start_rows = progress.rows_processed if progress else 0
+
+        def report(progress, elapsed):
+            rate = (progress.rows_processed - start_rows) / elapsed if elapsed else 0
+            self.stdout.write(
+                f'{progress.rows_processed} rows: {progress.imported} imported, '
+                f'{progress.skipped} skipped ({rate:.0f} rows/s)'
+            )
+
+        def report_error(number, message):
+            self.stderr.write(f'Row {number}: {message}')
+
+        try:
+            progress = import_complaints(
+                read_rows(path, options['format']),
+                name,
+                batch_size=options['batch_size'],
+                create_customers=options['create_customers'],
+                on_batch=report,
+                on_error=report_error,
+            )
+        except Exception as exc:
+            raise CommandError(f'Import stopped: {exc}. Run the same command again to resume.') from exc
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {progress.imported} complaint(s), skipped {progress.skipped}.'
+        ))
@@ -0,0 +1,19 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from complaints.images import adopt_legacy_images, process_pending, reset_stalled
+
+
+class Command(BaseCommand):
+    help = 'Process queued complaint photos, e.g. after a restart interrupted the worker pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stale-minutes', type=int, default=10, help='Requeue uploads stuck in processing for this long')
+        parser.add_argument('--legacy', action='store_true', help='Also process photos uploaded before the pipeline existed')
+
+    def handle(self, *args, **options):
+        reset = reset_stalled(timedelta(minutes=options['stale_minutes']))
+        adopted = adopt_legacy_images() if options['legacy'] else 0
+        processed = process_pending()
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {processed} image(s) ({reset} requeued, {adopted} legacy).'
+        ))
@@ -0,0 +1,14 @@
+from datetime import date
+from django.core.management.base import BaseCommand
+from complaints.trends import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Backfill the daily trend rollup from the complaints and status update history'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=date.fromisoformat, help='Only rebuild days from this date (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        count = rebuild(options['since'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} daily rollup row(s).'))
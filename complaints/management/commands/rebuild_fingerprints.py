@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from complaints.dedup import rebuild_fingerprints
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the near-duplicate fingerprint index for open complaints'
+
+    def handle(self, *args, **options):
+        count = rebuild_fingerprints()
+        self.stdout.write(self.style.SUCCESS(f'Fingerprinted {count} open complaint(s).'))
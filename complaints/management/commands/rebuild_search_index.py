@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from complaints.search import is_supported, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the complaint full-text search index'
+
+    def handle(self, *args, **options):
+        if not is_supported():
+            self.stdout.write(self.style.WARNING('Full-text index is only used on SQLite; nothing to rebuild.'))
+            return
+        count = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} complaint(s).'))
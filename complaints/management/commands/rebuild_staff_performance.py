@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from complaints.performance import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the staff performance rollup table from the complaints table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--staff', type=int, nargs='+', help='Only rebuild rollups for these staff user ids')
+
+    def handle(self, *args, **options):
+        count = rebuild(options['staff'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt performance rollups for {count} staff member(s).'))
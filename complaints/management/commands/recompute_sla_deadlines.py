@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from complaints.models import Complaint
+from complaints.sla import backfill_deadlines
+
+
+class Command(BaseCommand):
+    help = 'Recompute complaint SLA deadlines after the SLA policy settings change'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--missing-only', action='store_true', help='Only fill complaints without a deadline')
+
+    def handle(self, *args, **options):
+        count = backfill_deadlines(Complaint, only_missing=options['missing_only'])
+        self.stdout.write(self.style.SUCCESS(f'Updated SLA deadlines for {count} complaint(s).'))
@@ -0,0 +1,111 @@
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from .profiling import QueryRecorder, RequestProfile, record, start_recording, stop_recording
+from .replicas import begin_request, end_request
+
+
+class QueryProfilingMiddleware:
+    """Record latency, query count, query time and repeated queries of every request.
+
+    Queries reach the active recorder through a context variable, so requests
+    are profiled under WSGI and ASGI alike, including sync views that ASGI runs
+    in a worker thread. Streamed responses are recorded once their content has
+    been sent; async streams are recorded when the view returns.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'REQUEST_PROFILING', True)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        token = start_recording(recorder)
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_recording(token)
+        return self._finish(request, response, recorder, started)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        token = start_recording(recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_recording(token)
+        return self._finish(request, response, recorder, started)
+
+    def _finish(self, request, response, recorder, started):
+        if response.streaming and not response.is_async:
+            response.streaming_content = self._stream(response.streaming_content, request, response, recorder, started)
+        else:
+            self._record(request, response, recorder, started)
+        return response
+
+    def _stream(self, content, request, response, recorder, started):
+        token = start_recording(recorder)
+        try:
+            yield from content
+        finally:
+            stop_recording(token)
+            self._record(request, response, recorder, started)
+
+    def _record(self, request, response, recorder, started):
+        match = request.resolver_match
+        record(RequestProfile(
+            view_name=match.view_name if match else 'unresolved',
+            method=request.method,
+            status=response.status_code,
+            duration_ms=(time.perf_counter() - started) * 1000,
+            query_count=recorder.count,
+            query_ms=recorder.duration * 1000,
+            duplicates=recorder.duplicates(),
+        ))
+
+
+class ReplicaPinMiddleware:
+    """Pin a client that wrote to the primary for REPLICA_LAG_SECONDS, so replica
+    reads never show it a complaint older than the one it just saved.
+
+    Sits last so session saves after the view do not count as writes.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = begin_request()
+        response = self.get_response(request)
+        end_request(token, response)
+        return response
+
+    async def __acall__(self, request):
+        # Writes made by a sync view in its worker thread are copied back into this context
+        token = begin_request()
+        response = await self.get_response(request)
+        end_request(token, response)
+        return response
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_staff_performance(apps, schema_editor):
+    from complaints.performance import rebuild
+
+    rebuild(
+        complaint_model=apps.get_model('complaints', 'Complaint'),
+        performance_model=apps.get_model('complaints', 'StaffPerformance'),
+        user_model=apps.get_model(settings.AUTH_USER_MODEL),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0002_alter_statusupdate_new_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaffPerformance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('assigned', models.PositiveIntegerField(default=0)),
+                ('pending', models.PositiveIntegerField(default=0)),
+                ('in_progress', models.PositiveIntegerField(default=0)),
+                ('resolved', models.PositiveIntegerField(default=0)),
+                ('resolution_hours_total', models.FloatField(default=0)),
+                ('resolution_count', models.PositiveIntegerField(default=0)),
+                ('rating_total', models.PositiveIntegerField(default=0)),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('staff', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='performance', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Staff Performance',
+                'verbose_name_plural': 'Staff Performance',
+            },
+        ),
+        migrations.RunPython(backfill_staff_performance, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_sla_deadlines(apps, schema_editor):
+    from complaints.sla import backfill_deadlines
+
+    Complaint = apps.get_model('complaints', 'Complaint')
+    backfill_deadlines(Complaint)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0005_complaint_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='complaint',
+            name='sla_deadline',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(condition=models.Q(('status__in', ['submitted', 'in_progress'])), fields=['sla_deadline'], name='complaint_open_sla_idx'),
+        ),
+        migrations.RunPython(backfill_sla_deadlines, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+from django.db import migrations
+
+# Frozen copy of search.POPULATE_SQL as of this migration; later versions read tables created after it
+POPULATE_SQL = (
+    "INSERT INTO complaints_search(rowid, title, description, address, notes) "
+    "SELECT c.id, c.title, c.description, c.address, "
+    "COALESCE((SELECT group_concat(u.notes, ' ') FROM complaints_statusupdate u WHERE u.complaint_id = c.id), '') "
+    "FROM complaints_complaint c"
+)
+
+
+def create_search_index(apps, schema_editor):
+    from complaints import search
+
+    if not search.is_supported(schema_editor.connection):
+        return
+    schema_editor.execute(search.CREATE_TABLE_SQL)
+    schema_editor.execute(POPULATE_SQL)
+
+
+def drop_search_index(apps, schema_editor):
+    from complaints import search
+
+    if search.is_supported(schema_editor.connection):
+        schema_editor.execute(search.DROP_TABLE_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0006_complaint_sla_deadline'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_locations(apps, schema_editor):
+    from complaints.geo import encode_geohash, parse_coordinates
+
+    Complaint = apps.get_model('complaints', 'Complaint')
+    batch = []
+    for complaint in Complaint.objects.exclude(gps_coordinates__isnull=True).exclude(gps_coordinates='').only('gps_coordinates').iterator(chunk_size=2000):
+        point = parse_coordinates(complaint.gps_coordinates)
+        if not point:
+            continue
+        complaint.latitude, complaint.longitude = point
+        complaint.geohash = encode_geohash(*point)
+        batch.append(complaint)
+        if len(batch) >= 2000:
+            Complaint.objects.bulk_update(batch, ['latitude', 'longitude', 'geohash'])
+            batch = []
+    Complaint.objects.bulk_update(batch, ['latitude', 'longitude', 'geohash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0007_complaint_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='complaint',
+            name='geohash',
+            field=models.CharField(blank=True, editable=False, max_length=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='complaint',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='complaint',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(fields=['latitude', 'longitude'], name='complaint_location_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(fields=['geohash'], name='complaint_geohash_idx'),
+        ),
+        migrations.RunPython(backfill_locations, migrations.RunPython.noop),
+    ]
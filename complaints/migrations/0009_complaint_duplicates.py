@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0008_complaint_location'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='complaint',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='complaints.complaint'),
+        ),
+        migrations.CreateModel(
+            name='ComplaintFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('complaint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fingerprints', to='complaints.complaint')),
+            ],
+            options={
+                'verbose_name': 'Complaint Fingerprint',
+                'verbose_name_plural': 'Complaint Fingerprints',
+                'indexes': [models.Index(fields=['band', 'bucket'], name='fingerprint_bucket_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0012_liveevent'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssignmentProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('categories', models.JSONField(blank=True, default=list)),
+                ('areas', models.JSONField(blank=True, default=list, help_text='Area names matched against complaint addresses')),
+                ('max_open', models.PositiveIntegerField(default=20, help_text='Open complaints at which no more are routed')),
+                ('auto_assign', models.BooleanField(default=True)),
+                ('staff', models.OneToOneField(limit_choices_to={'role': 'staff'}, on_delete=django.db.models.deletion.CASCADE, related_name='assignment_profile', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Assignment Profile',
+                'verbose_name_plural': 'Assignment Profiles',
+            },
+        ),
+    ]
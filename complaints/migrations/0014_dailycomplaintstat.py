@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0013_assignmentprofile'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyComplaintStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('category', models.CharField(choices=[('leak', 'Water Leak'), ('no_water', 'No Water Supply'), ('billing', 'Billing Issue'), ('water_quality', 'Water Quality'), ('meter_issue', 'Meter Issue'), ('pressure', 'Low Water Pressure'), ('other', 'Other')], max_length=20)),
+                ('status', models.CharField(choices=[('submitted', 'Submitted'), ('in_progress', 'In Progress'), ('resolved', 'Resolved'), ('closed', 'Closed')], max_length=20)),
+                ('entered', models.PositiveIntegerField(default=0)),
+                ('resolved', models.PositiveIntegerField(default=0)),
+                ('sla_breached', models.PositiveIntegerField(default=0)),
+                ('resolution_hours_total', models.FloatField(default=0)),
+                ('staff', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Daily Complaint Stat',
+                'verbose_name_plural': 'Daily Complaint Stats',
+                'constraints': [models.UniqueConstraint(condition=models.Q(('staff__isnull', False)), fields=('date', 'category', 'status', 'staff'), name='dailystat_unique_staff'), models.UniqueConstraint(condition=models.Q(('staff__isnull', True)), fields=('date', 'category', 'status'), name='dailystat_unique_unassigned')],
+            },
+        ),
+    ]
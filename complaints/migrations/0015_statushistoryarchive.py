@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('complaints', '0014_dailycomplaintstat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusHistoryArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.BinaryField()),
+                ('update_count', models.PositiveIntegerField(default=0)),
+                ('last_update_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now=True)),
+                ('complaint', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='history_archive', to='complaints.complaint')),
+            ],
+            options={
+                'verbose_name': 'Status History Archive',
+                'verbose_name_plural': 'Status History Archives',
+            },
+        ),
+    ]
@@ -1,8 +1,51 @@
-from django.db import models
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Length
 from django.conf import settings
 from django.utils import timezone
 import uuid
 
+class ComplaintQuerySet(models.QuerySet):
+    """Query presets for complaint listings"""
+    
+    # Columns rendered by the table-style listings
+    TABLE_FIELDS = [
+        'complaint_id', 'title', 'category', 'priority', 'status', 'created_at', 'updated_at', 'sla_deadline',
+        'customer__username', 'assigned_to__username',
+    ]
+    
+    def with_users(self):
+        """Join the customer and assignee so templates don't query per row"""
+        return self.select_related('customer', 'assigned_to')
+    
+    def for_cards(self):
+        """Card listings that show a description excerpt"""
+        return self.with_users().select_related('image_upload__asset').defer('customer_feedback')
+    
+    def for_table(self):
+        """Table listings that only show the summary columns"""
+        return self.with_users().only(*self.TABLE_FIELDS)
+    
+    def open(self):
+        return self.filter(status__in=['submitted', 'in_progress'])
+    
+    def unassigned(self):
+        """The queue of submitted complaints nobody has picked up"""
+        return self.filter(assigned_to__isnull=True, status='submitted')
+    
+    def overdue(self, now=None):
+        """Open complaints past their SLA deadline.
+        
+        The open statuses are written into the SQL rather than bound: SQLite only
+        uses the partial complaint_open_sla_idx when a query repeats its condition
+        literally, which it never does for parameters.
+        """
+        quote = connections[self.db].ops.quote_name
+        status = f"{quote(self.model._meta.db_table)}.{quote('status')}"
+        is_open = RawSQL(f"{status} IN ('submitted', 'in_progress')", [], output_field=models.BooleanField())
+        return self.filter(is_open, sla_deadline__lt=now or timezone.now())
+
+
 class Complaint(models.Model):
     """Model for customer complaints"""
     
@@ -48,6 +91,15 @@ class Complaint(models.Model):
         limit_choices_to={'role': 'staff'}
     )
     
+    # Earlier complaint about the same incident, set when a near-duplicate is submitted
+    parent = models.ForeignKey(
+        'self', 
+        on_delete=models.SET_NULL, 
+        null=True, 
+        blank=True, 
+        related_name='duplicates'
+    )
+    
     # Complaint Details
     category = models.CharField(max_length=20, choices=CATEGORY_CHOICES)
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='medium')
@@ -59,39 +111,110 @@ class Complaint(models.Model):
     # Location
     address = models.TextField()
     gps_coordinates = models.CharField(max_length=50, blank=True, null=True)
+    # Parsed from gps_coordinates on save for location queries
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
+    geohash = models.CharField(max_length=12, null=True, blank=True, editable=False)
     
     # File Upload
     image = models.ImageField(upload_to='complaints/', blank=True, null=True)
     
-    # Timestamps
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Timestamps (default rather than auto_now_add so imports can keep original dates)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
     resolved_at = models.DateTimeField(null=True, blank=True)
     
+    # Open complaints past this time are overdue; set from the priority/category SLA policy
+    sla_deadline = models.DateTimeField(null=True, blank=True, editable=False)
+    
     # Customer Satisfaction
     customer_rating = models.IntegerField(null=True, blank=True, choices=[(i, i) for i in range(1, 6)])
     customer_feedback = models.TextField(blank=True, null=True)
     
+    objects = ComplaintQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Complaint'
         verbose_name_plural = 'Complaints'
+        indexes = [
+            # Newest-first listings and keyset pagination on (created_at, id)
+            models.Index(fields=['created_at', 'id'], name='complaint_created_idx'),
+            models.Index(fields=['status', 'created_at', 'id'], name='complaint_status_idx'),
+            models.Index(fields=['category', 'created_at', 'id'], name='complaint_category_idx'),
+            models.Index(fields=['priority', 'created_at', 'id'], name='complaint_priority_idx'),
+            models.Index(fields=['customer', 'created_at', 'id'], name='complaint_customer_idx'),
+            # Staff dashboards: per-assignee listings and status counts
+            models.Index(fields=['assigned_to', 'status'], name='complaint_assignee_status_idx'),
+            models.Index(fields=['assigned_to', 'created_at', 'id'], name='complaint_assignee_idx'),
+            # This-month resolution counts
+            models.Index(fields=['resolved_at'], name='complaint_resolved_idx'),
+            # Open backlog and the unassigned queue stay small relative to the table
+            models.Index(
+                fields=['created_at', 'id'],
+                condition=models.Q(status__in=['submitted', 'in_progress']),
+                name='complaint_open_idx',
+            ),
+            models.Index(
+                fields=['created_at', 'id'],
+                condition=models.Q(assigned_to__isnull=True, status='submitted'),
+                name='complaint_unassigned_idx',
+            ),
+            # Location lookups: bounding boxes and geohash cell clustering
+            models.Index(fields=['latitude', 'longitude'], name='complaint_location_idx'),
+            models.Index(fields=['geohash'], name='complaint_geohash_idx'),
+            # Overdue checks: open complaints past their SLA deadline
+            models.Index(
+                fields=['sla_deadline'],
+                condition=models.Q(status__in=['submitted', 'in_progress']),
+                name='complaint_open_sla_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.complaint_id} - {self.title}"
     
     def save(self, *args, **kwargs):
+        from .dedup import FINGERPRINT_FIELDS
+        from .performance import stored_state, tracked_state, apply_change
+        from .sla import deadline_for
+        
         # Generate complaint ID if not exists
         if not self.complaint_id:
             year = timezone.now().year
-            count = Complaint.objects.filter(created_at__year=year).count() + 1
-            self.complaint_id = f"GWCL-{year}-{count:05d}"
+            number = ComplaintSequence.reserve(year)[0]
+            self.complaint_id = self.format_complaint_id(year, number)
         
         # Set resolved_at when status changes to resolved
         if self.status == 'resolved' and not self.resolved_at:
             self.resolved_at = timezone.now()
         
-        super().save(*args, **kwargs)
+        # Keep the SLA deadline in line with the current priority and category
+        self.sla_deadline = deadline_for(self.created_at, self.priority, self.category)
+        
+        # Numeric location from the free-text GPS coordinates
+        self.set_location()
+        
+        with transaction.atomic():
+            # Previous values feed the staff performance rollup and the fingerprint receiver
+            old_state = stored_state(self.pk, *FINGERPRINT_FIELDS) if self.pk else None
+            self._stored_state = old_state
+            super().save(*args, **kwargs)
+            apply_change(old_state, tracked_state(self, old_state, kwargs.get('update_fields')))
+    
+    def set_location(self):
+        from .geo import encode_geohash, parse_coordinates
+        
+        point = parse_coordinates(self.gps_coordinates)
+        if point:
+            self.latitude, self.longitude = point
+            self.geohash = encode_geohash(*point)
+        else:
+            self.latitude = self.longitude = self.geohash = None
+    
+    @staticmethod
+    def format_complaint_id(year, number):
+        return f"GWCL-{year}-{number:05d}"
     
     @property
     def response_time(self):
@@ -103,11 +226,140 @@ class Complaint(models.Model):
     
     @property
     def is_overdue(self):
-        """Check if complaint is overdue (more than 48 hours)"""
+        """Check if complaint is past its SLA deadline"""
         if self.status in ['resolved', 'closed']:
             return False
-        delta = timezone.now() - self.created_at
-        return delta.total_seconds() > (48 * 3600)
+        if self.sla_deadline is None:
+            from .sla import deadline_for
+            return timezone.now() > deadline_for(self.created_at, self.priority, self.category)
+        return timezone.now() > self.sla_deadline
+
+
+class ComplaintSequence(models.Model):
+    """Per-year counter used to allocate complaint IDs"""
+    
+    year = models.PositiveIntegerField(primary_key=True)
+    last_value = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        verbose_name = 'Complaint Sequence'
+        verbose_name_plural = 'Complaint Sequences'
+    
+    def __str__(self):
+        return f"{self.year}: {self.last_value}"
+    
+    @classmethod
+    def reserve(cls, year, count=1):
+        """Atomically reserve the next ``count`` numbers for a year and return them as a range"""
+        with transaction.atomic():
+            # The UPDATE takes the row's write lock until the transaction ends
+            updated = cls.objects.filter(year=year).update(last_value=models.F('last_value') + count)
+            if not updated:
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(year=year, last_value=cls.initial_value(year) + count)
+                except IntegrityError:
+                    # Another worker created the row first
+                    cls.objects.filter(year=year).update(last_value=models.F('last_value') + count)
+            last_value = cls.objects.filter(year=year).values_list('last_value', flat=True).get()
+        return range(last_value - count + 1, last_value + 1)
+    
+    @classmethod
+    def initial_value(cls, year):
+        """Highest number already used for a year, for complaints created before the sequence existed"""
+        prefix = Complaint.format_complaint_id(year, 0)[:-5]
+        latest = (
+            Complaint.objects.filter(complaint_id__startswith=prefix)
+            .order_by(Length('complaint_id').desc(), '-complaint_id')
+            .values_list('complaint_id', flat=True)
+            .first()
+        )
+        return int(latest[len(prefix):]) if latest else 0
+
+
+class ComplaintFingerprint(models.Model):
+    """One LSH band of an open complaint's MinHash signature, used to find near-duplicates"""
+    
+    complaint = models.ForeignKey(
+        Complaint, 
+        on_delete=models.CASCADE, 
+        related_name='fingerprints'
+    )
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+    
+    class Meta:
+        verbose_name = 'Complaint Fingerprint'
+        verbose_name_plural = 'Complaint Fingerprints'
+        indexes = [
+            models.Index(fields=['band', 'bucket'], name='fingerprint_bucket_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.complaint_id} band {self.band}"
+
+
+class ImageAsset(models.Model):
+    """Processed complaint photo and its renditions, stored once per distinct upload"""
+    
+    content_hash = models.CharField(max_length=64, unique=True)
+    image = models.ImageField(upload_to='complaints/images/')
+    detail_thumbnail = models.ImageField(upload_to='complaints/images/')
+    list_thumbnail = models.ImageField(upload_to='complaints/images/')
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Image Asset'
+        verbose_name_plural = 'Image Assets'
+    
+    def __str__(self):
+        return self.content_hash
+
+
+class ImageUpload(models.Model):
+    """Photo submitted with a complaint, queued for background processing"""
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+    
+    complaint = models.OneToOneField(
+        Complaint, 
+        on_delete=models.CASCADE, 
+        related_name='image_upload'
+    )
+    original = models.FileField(upload_to='complaints/incoming/', blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    asset = models.ForeignKey(
+        ImageAsset, 
+        on_delete=models.SET_NULL, 
+        null=True, 
+        blank=True,
+        related_name='uploads'
+    )
+    error = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = 'Image Upload'
+        verbose_name_plural = 'Image Uploads'
+        indexes = [
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(status__in=['pending', 'processing']),
+                name='imageupload_queue_idx',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.complaint_id} image ({self.status})"
 
 
 class StatusUpdate(models.Model):
@@ -129,7 +381,7 @@ class StatusUpdate(models.Model):
     new_status = models.CharField(max_length=20, choices=STATUS_CHOICES)  # Add choices here
     notes = models.TextField()
     
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         ordering = ['-created_at']
@@ -137,4 +389,183 @@ class StatusUpdate(models.Model):
         verbose_name_plural = 'Status Updates'
     
     def __str__(self):
-        return f"{self.complaint.complaint_id} - {self.new_status} at {self.created_at}"
\ No newline at end of file
+        return f"{self.complaint.complaint_id} - {self.new_status} at {self.created_at}"
+
+
+class StatusHistoryArchive(models.Model):
+    """Status updates of a long-closed complaint, moved out of StatusUpdate as one compressed blob"""
+    
+    complaint = models.OneToOneField(
+        Complaint, 
+        on_delete=models.CASCADE, 
+        related_name='history_archive'
+    )
+    # zlib-compressed JSON list of updates, oldest first
+    data = models.BinaryField()
+    update_count = models.PositiveIntegerField(default=0)
+    last_update_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Status History Archive'
+        verbose_name_plural = 'Status History Archives'
+    
+    def __str__(self):
+        return f"{self.complaint_id}: {self.update_count} archived update(s)"
+
+
+class StaffPerformance(models.Model):
+    """Per-staff rollup of assigned complaints, kept up to date on every complaint save"""
+    
+    staff = models.OneToOneField(
+        settings.AUTH_USER_MODEL, 
+        on_delete=models.CASCADE, 
+        related_name='performance'
+    )
+    
+    # Complaint counts by status
+    assigned = models.PositiveIntegerField(default=0)
+    pending = models.PositiveIntegerField(default=0)
+    in_progress = models.PositiveIntegerField(default=0)
+    resolved = models.PositiveIntegerField(default=0)
+    
+    # Running totals for averages
+    resolution_hours_total = models.FloatField(default=0)
+    resolution_count = models.PositiveIntegerField(default=0)
+    rating_total = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Staff Performance'
+        verbose_name_plural = 'Staff Performance'
+    
+    def __str__(self):
+        return f"{self.staff.username} - {self.resolved}/{self.assigned} resolved"
+    
+    @property
+    def open_count(self):
+        """Assigned complaints that are not yet resolved"""
+        return self.pending + self.in_progress
+    
+    @property
+    def avg_resolution_time(self):
+        """Average resolution time in hours"""
+        if self.resolution_count:
+            return round(self.resolution_hours_total / self.resolution_count, 2)
+        return None
+    
+    @property
+    def avg_rating(self):
+        if self.rating_count:
+            return round(self.rating_total / self.rating_count, 1)
+        return None
+    
+    @property
+    def resolution_rate(self):
+        if self.assigned:
+            return round((self.resolved / self.assigned * 100), 1)
+        return 0
+
+
+class DailyComplaintStat(models.Model):
+    """Complaints entering each status per day, category and staff member, for trend charts.
+
+    Submissions are recorded under status 'submitted' with no staff; every
+    status update adds to the row of its new status and the user who made it.
+    """
+    
+    date = models.DateField()
+    category = models.CharField(max_length=20, choices=Complaint.CATEGORY_CHOICES)
+    status = models.CharField(max_length=20, choices=Complaint.STATUS_CHOICES)
+    staff = models.ForeignKey(
+        settings.AUTH_USER_MODEL, 
+        on_delete=models.CASCADE, 
+        null=True, 
+        blank=True,
+        related_name='daily_stats'
+    )
+    
+    entered = models.PositiveIntegerField(default=0)
+    # Updates that moved a complaint from open to resolved/closed, and those past the SLA deadline
+    resolved = models.PositiveIntegerField(default=0)
+    sla_breached = models.PositiveIntegerField(default=0)
+    resolution_hours_total = models.FloatField(default=0)
+    
+    class Meta:
+        verbose_name = 'Daily Complaint Stat'
+        verbose_name_plural = 'Daily Complaint Stats'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'category', 'status', 'staff'],
+                condition=models.Q(staff__isnull=False),
+                name='dailystat_unique_staff',
+            ),
+            # NULLs never collide in a unique index, so unassigned rows need their own
+            models.UniqueConstraint(
+                fields=['date', 'category', 'status'],
+                condition=models.Q(staff__isnull=True),
+                name='dailystat_unique_unassigned',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} {self.category} {self.status}: {self.entered}"
+
+
+class AssignmentProfile(models.Model):
+    """Which complaints the assignment engine may route to a staff member"""
+    
+    staff = models.OneToOneField(
+        settings.AUTH_USER_MODEL, 
+        on_delete=models.CASCADE, 
+        related_name='assignment_profile',
+        limit_choices_to={'role': 'staff'}
+    )
+    # Empty lists mean every category / every area
+    categories = models.JSONField(default=list, blank=True)
+    areas = models.JSONField(default=list, blank=True, help_text='Area names matched against complaint addresses')
+    max_open = models.PositiveIntegerField(default=20, help_text='Open complaints at which no more are routed')
+    auto_assign = models.BooleanField(default=True)
+    
+    class Meta:
+        verbose_name = 'Assignment Profile'
+        verbose_name_plural = 'Assignment Profiles'
+    
+    def __str__(self):
+        return f"{self.staff.username} routing"
+
+
+class ComplaintImport(models.Model):
+    """Progress of a bulk complaint import, saved with each batch so it can resume"""
+    
+    name = models.CharField(max_length=255, unique=True)
+    rows_processed = models.PositiveBigIntegerField(default=0)
+    imported = models.PositiveBigIntegerField(default=0)
+    skipped = models.PositiveBigIntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = 'Complaint Import'
+        verbose_name_plural = 'Complaint Imports'
+    
+    def __str__(self):
+        return f"{self.name}: {self.imported} imported, {self.skipped} skipped"
+
+
+class LiveEvent(models.Model):
+    """Dashboard update shared between worker processes by the database live-update broker"""
+    
+    kind = models.CharField(max_length=20)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+    
+    class Meta:
+        verbose_name = 'Live Event'
+        verbose_name_plural = 'Live Events'
+    
+    def __str__(self):
+        return f"{self.kind} #{self.pk}"
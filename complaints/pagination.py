@@ -0,0 +1,105 @@
+import base64
+from datetime import datetime
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(complaint):
+    """Encode a row's (created_at, id) position as an opaque query string value"""
+    raw = f"{complaint.created_at.isoformat()}|{complaint.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor back into (created_at, id), or None if it is missing or malformed"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def page_size_from(params, default=DEFAULT_PAGE_SIZE):
+    """Read the requested page size, capped at MAX_PAGE_SIZE"""
+    try:
+        size = int(params.get('size', default))
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+class KeysetPage:
+    """One page of a newest-first listing with cursors to its neighbours"""
+
+    def __init__(self, items, params, has_next, has_previous):
+        self.items = items
+        self.has_next = has_next and bool(items)
+        self.has_previous = has_previous and bool(items)
+        self.params = params
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+    def _query(self, key, cursor):
+        params = self.params.copy()
+        params.pop('after', None)
+        params.pop('before', None)
+        params[key] = cursor
+        return params.urlencode()
+
+    @property
+    def next_query(self):
+        return self._query('after', encode_cursor(self.items[-1])) if self.has_next else ''
+
+    @property
+    def previous_query(self):
+        return self._query('before', encode_cursor(self.items[0])) if self.has_previous else ''
+
+
+def paginate(queryset, params, page_size=None):
+    """Return a KeysetPage of the queryset ordered by (-created_at, -id).
+
+    ``after`` moves to older rows and ``before`` to newer rows. Both are
+    seek conditions on (created_at, id), so deep pages cost the same as
+    the first one.
+    """
+    size = page_size_from(params, page_size or DEFAULT_PAGE_SIZE)
+    after = decode_cursor(params.get('after'))
+    before = decode_cursor(params.get('before'))
+
+    if before:
+        created_at, pk = before
+        rows = list(
+            queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
+            .order_by('created_at', 'id')[:size + 1]
+        )
+        if rows:
+            return KeysetPage(rows[:size][::-1], params, has_next=True, has_previous=len(rows) > size)
+        # Nothing newer than the cursor: fall back to the first page
+        after = None
+
+    rows = list(page_query(queryset, size, after))
+    return KeysetPage(rows[:size], params, has_next=len(rows) > size, has_previous=after is not None)
+
+
+def page_query(queryset, size, after=None):
+    """The query paginate() runs for the page older than ``after``, or the first page.
+
+    One extra row is fetched to tell whether a next page exists.
+    """
+    queryset = queryset.order_by('-created_at', '-id')
+    if after:
+        created_at, pk = after
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+    return queryset[:size + 1]
@@ -0,0 +1,129 @@
+from django.db import transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum
+from .models import Complaint, StaffPerformance
+
+# Complaint fields that affect the staff performance rollup
+TRACKED_FIELDS = ['assigned_to_id', 'status', 'created_at', 'resolved_at', 'customer_rating']
+
+COUNTER_FIELDS = [
+    'assigned', 'pending', 'in_progress', 'resolved',
+    'resolution_hours_total', 'resolution_count', 'rating_total', 'rating_count',
+]
+
+
+def stored_state(pk, *extra_fields):
+    """Return the tracked field values, and any ``extra_fields``, currently saved for a complaint"""
+    return Complaint.objects.filter(pk=pk).values(*TRACKED_FIELDS, *extra_fields).first()
+
+
+def tracked_state(complaint, old_state=None, update_fields=None):
+    """Return the tracked field values of an in-memory complaint.
+
+    When only some fields were saved, the rest keep their stored values.
+    """
+    state = {field: getattr(complaint, field) for field in TRACKED_FIELDS}
+    if old_state is not None and update_fields is not None:
+        saved = {complaint._meta.get_field(name).attname for name in update_fields}
+        state = {field: state[field] if field in saved else old_state[field] for field in TRACKED_FIELDS}
+    return state
+
+
+def contribution(state):
+    """Counter values a single complaint adds to its assignee's rollup"""
+    counters = dict.fromkeys(COUNTER_FIELDS, 0)
+    if not state or not state['assigned_to_id']:
+        return counters
+
+    counters['assigned'] = 1
+    if state['status'] == 'submitted':
+        counters['pending'] = 1
+    elif state['status'] == 'in_progress':
+        counters['in_progress'] = 1
+    elif state['status'] in ['resolved', 'closed']:
+        counters['resolved'] = 1
+        if state['resolved_at']:
+            delta = state['resolved_at'] - state['created_at']
+            counters['resolution_hours_total'] = delta.total_seconds() / 3600
+            counters['resolution_count'] = 1
+        if state['customer_rating']:
+            counters['rating_total'] = state['customer_rating']
+            counters['rating_count'] = 1
+    return counters
+
+
+def _apply_delta(staff_id, delta):
+    delta = {field: value for field, value in delta.items() if value}
+    if not delta:
+        return
+    updated = StaffPerformance.objects.filter(staff_id=staff_id).update(
+        **{field: F(field) + value for field, value in delta.items()}
+    )
+    if not updated:
+        # No rollup row yet: build it from the complaints table
+        rebuild([staff_id])
+
+
+def apply_change(old_state, new_state):
+    """Update staff rollups for a complaint moving from old_state to new_state"""
+    old_staff = old_state['assigned_to_id'] if old_state else None
+    new_staff = new_state['assigned_to_id'] if new_state else None
+    old_counters = contribution(old_state)
+    new_counters = contribution(new_state)
+
+    if old_staff == new_staff:
+        if new_staff:
+            _apply_delta(new_staff, {f: new_counters[f] - old_counters[f] for f in COUNTER_FIELDS})
+        return
+
+    if old_staff:
+        _apply_delta(old_staff, {f: -old_counters[f] for f in COUNTER_FIELDS})
+    if new_staff:
+        _apply_delta(new_staff, new_counters)
+
+
+def rebuild(staff_ids=None, complaint_model=Complaint, performance_model=StaffPerformance, user_model=None):
+    """Recompute staff rollups from scratch, for all staff or only the given ids.
+
+    Data migrations pass their historical models.
+    """
+    if user_model is None:
+        from users.models import User as user_model
+
+    closed = Q(status__in=['resolved', 'closed'])
+    resolution_time = ExpressionWrapper(F('resolved_at') - F('created_at'), output_field=DurationField())
+
+    complaints = complaint_model.objects.filter(assigned_to__isnull=False)
+    staff = user_model.objects.filter(role='staff')
+    if staff_ids is not None:
+        complaints = complaints.filter(assigned_to_id__in=staff_ids)
+        staff = user_model.objects.filter(pk__in=staff_ids)
+
+    rows = complaints.order_by().values('assigned_to_id').annotate(
+        assigned=Count('id'),
+        pending=Count('id', filter=Q(status='submitted')),
+        in_progress=Count('id', filter=Q(status='in_progress')),
+        resolved=Count('id', filter=closed),
+        resolution_time=Sum(resolution_time, filter=closed & Q(resolved_at__isnull=False)),
+        resolution_count=Count('id', filter=closed & Q(resolved_at__isnull=False)),
+        rating_total=Sum('customer_rating', filter=closed & Q(customer_rating__isnull=False)),
+        rating_count=Count('id', filter=closed & Q(customer_rating__isnull=False)),
+    )
+
+    rollups = {pk: performance_model(staff_id=pk) for pk in staff.values_list('pk', flat=True)}
+    for row in rows:
+        resolution_time = row.pop('resolution_time')
+        staff_id = row.pop('assigned_to_id')
+        rollups[staff_id] = performance_model(
+            staff_id=staff_id,
+            resolution_hours_total=resolution_time.total_seconds() / 3600 if resolution_time else 0,
+            **{field: value or 0 for field, value in row.items()},
+        )
+
+    with transaction.atomic():
+        existing = performance_model.objects.all()
+        if staff_ids is not None:
+            existing = existing.filter(staff_id__in=staff_ids)
+        existing.delete()
+        performance_model.objects.bulk_create(rollups.values())
+
+    return len(rollups)
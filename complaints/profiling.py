@@ -0,0 +1,170 @@
+import json
+import logging
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER_SIZE = 2000
+DEFAULT_QUERY_BUDGET = 30
+
+# Duplicate fingerprints kept per request and shown per view
+TOP_DUPLICATES = 5
+
+_NUMBER = re.compile(r'\b\d+\b')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER_LIST = re.compile(r'%s(?:\s*,\s*%s)+')
+
+
+def fingerprint(sql):
+    """SQL with literals and IN-list lengths normalised, so repeats of one query compare equal"""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    return _PLACEHOLDER_LIST.sub('%s, ...', sql)
+
+
+class QueryRecorder:
+    """Database execute wrapper counting queries, their time and repeated fingerprints"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def duplicates(self):
+        """(fingerprint, times run) for queries run more than once, most repeated first"""
+        return [(sql, count) for sql, count in self.fingerprints.most_common(TOP_DUPLICATES) if count > 1]
+
+
+# Recorder of the request being handled; context variables follow a request from
+# the event loop into the thread running its sync view
+_current = ContextVar('query_recorder', default=None)
+
+
+def _dispatch(execute, sql, params, many, context):
+    recorder = _current.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+def install(connection):
+    """Route a connection's queries to whichever recorder is active in the running context"""
+    if _dispatch not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_dispatch)
+
+
+def start_recording(recorder):
+    return _current.set(recorder)
+
+
+def stop_recording(token):
+    _current.reset(token)
+
+
+@dataclass
+class RequestProfile:
+    view_name: str
+    method: str
+    status: int
+    duration_ms: float
+    query_count: int
+    query_ms: float
+    duplicates: list = field(default_factory=list)
+
+
+class ProfileBuffer:
+    """The most recent request profiles of this process, oldest dropped first"""
+
+    def __init__(self, size=DEFAULT_BUFFER_SIZE):
+        self._profiles = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, profile):
+        with self._lock:
+            self._profiles.append(profile)
+
+    def snapshot(self):
+        with self._lock:
+            return list(self._profiles)
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+
+
+buffer = ProfileBuffer(getattr(settings, 'REQUEST_PROFILE_BUFFER_SIZE', DEFAULT_BUFFER_SIZE))
+
+
+def query_budget(view_name):
+    budgets = getattr(settings, 'QUERY_BUDGETS', {})
+    return budgets.get(view_name, getattr(settings, 'DEFAULT_QUERY_BUDGET', DEFAULT_QUERY_BUDGET))
+
+
+def record(profile):
+    """Store a profile and log it when the view went over its query budget"""
+    buffer.add(profile)
+    budget = query_budget(profile.view_name)
+    if profile.query_count > budget:
+        logger.warning(json.dumps({
+            'event': 'query_budget_exceeded',
+            'view': profile.view_name,
+            'method': profile.method,
+            'status': profile.status,
+            'queries': profile.query_count,
+            'budget': budget,
+            'query_ms': round(profile.query_ms, 2),
+            'duration_ms': round(profile.duration_ms, 2),
+            'duplicates': [{'sql': sql[:200], 'count': count} for sql, count in profile.duplicates],
+        }))
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of already sorted values"""
+    if not values:
+        return None
+    rank = max(1, -(-len(values) * pct // 100))
+    return values[int(rank) - 1]
+
+
+def summary(profiles=None):
+    """Per-view latency percentiles, query counts and the most repeated queries, slowest p95 first"""
+    by_view = {}
+    for profile in buffer.snapshot() if profiles is None else profiles:
+        by_view.setdefault(profile.view_name, []).append(profile)
+
+    rows = []
+    for view_name, group in by_view.items():
+        durations = sorted(profile.duration_ms for profile in group)
+        queries = [profile.query_count for profile in group]
+        duplicates = Counter()
+        for profile in group:
+            duplicates.update(dict(profile.duplicates))
+        rows.append({
+            'view_name': view_name,
+            'requests': len(group),
+            'p50_ms': percentile(durations, 50),
+            'p95_ms': percentile(durations, 95),
+            'p99_ms': percentile(durations, 99),
+            'avg_queries': sum(queries) / len(queries),
+            'max_queries': max(queries),
+            'avg_query_ms': sum(profile.query_ms for profile in group) / len(group),
+            'budget': query_budget(view_name),
+            'over_budget': sum(count > query_budget(view_name) for count in queries),
+            'duplicates': duplicates.most_common(TOP_DUPLICATES),
+        })
+    return sorted(rows, key=lambda row: row['p95_ms'], reverse=True)
@@ -0,0 +1,112 @@
+import time
+from contextvars import ContextVar
+from functools import wraps
+from django.conf import settings
+from django.db import connections
+
+# Cookie holding the time until which a client that just wrote reads from the primary
+PIN_COOKIE = 'db_primary_until'
+
+_replica_reads = ContextVar('replica_reads', default=False)
+_wrote = ContextVar('wrote', default=False)
+
+
+def replica_alias():
+    """The configured read replica alias, or None when there is none"""
+    alias = getattr(settings, 'REPLICA_DATABASE', 'replica')
+    if alias not in connections.settings:
+        return None
+    # A test mirror points at the primary itself, and its separate connection
+    # would not see the primary's open test transaction
+    if connections[alias].settings_dict['NAME'] == connections['default'].settings_dict['NAME']:
+        return None
+    return alias
+
+
+def replica_lag():
+    return getattr(settings, 'REPLICA_LAG_SECONDS', 5)
+
+
+def is_pinned(request):
+    """Whether the client wrote recently enough that the replica may not have its change yet"""
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReplicaRouter:
+    """Send reads to the replica inside read_from_replica views, everything else to default.
+
+    Any write in a request switches its remaining reads back to the primary and
+    is noted so ReplicaPinMiddleware can pin the client.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get() and not _wrote.get():
+            return replica_alias()
+        return None
+
+    def db_for_write(self, model, **hints):
+        _wrote.set(True)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', replica_alias()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives its schema from the primary
+        if db == replica_alias():
+            return False
+        return None
+
+
+def _stream_from_replica(content):
+    token = _replica_reads.set(True)
+    try:
+        yield from content
+    finally:
+        _replica_reads.reset(token)
+
+
+async def _astream_from_replica(content):
+    token = _replica_reads.set(True)
+    try:
+        async for chunk in content:
+            yield chunk
+    finally:
+        _replica_reads.reset(token)
+
+
+def read_from_replica(view):
+    """Serve a read-only view from the replica unless the client is pinned to the primary"""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if is_pinned(request) or replica_alias() is None:
+            return view(request, *args, **kwargs)
+        token = _replica_reads.set(True)
+        try:
+            response = view(request, *args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+        if response.streaming:
+            # Streamed rows are read after the view returns
+            stream = _astream_from_replica if response.is_async else _stream_from_replica
+            response.streaming_content = stream(response.streaming_content)
+        return response
+    return wrapper
+
+
+def begin_request():
+    return _wrote.set(False)
+
+
+def end_request(token, response):
+    """Pin the client to the primary for the replica lag if the request wrote anything"""
+    if _wrote.get() and replica_alias() is not None:
+        lag = replica_lag()
+        response.set_cookie(PIN_COOKIE, f'{time.time() + lag:.3f}', max_age=lag, httponly=True, samesite='Lax')
+    _wrote.reset(token)
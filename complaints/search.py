@@ -0,0 +1,144 @@
+import re
+from django.db import connection, transaction
+from django.db.models import Q
+from .archive import archived_notes
+from .models import Complaint, StatusHistoryArchive, StatusUpdate
+
+SEARCH_TABLE = 'complaints_search'
+
+# bm25 weights for the title, description, address and notes columns
+COLUMN_WEIGHTS = (10.0, 5.0, 2.0, 1.0)
+
+MAX_RESULTS = 50
+
+CREATE_TABLE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+    "title, description, address, notes, prefix='2 3', tokenize='porter unicode61')"
+)
+DROP_TABLE_SQL = f"DROP TABLE IF EXISTS {SEARCH_TABLE}"
+
+# SQL function that unpacks the notes of a compressed status history archive
+ARCHIVED_NOTES_FUNCTION = 'archived_notes'
+
+# Rebuild every row from the complaint and its current and archived status update notes
+POPULATE_SQL = (
+    f"INSERT INTO {SEARCH_TABLE}(rowid, title, description, address, notes) "
+    "SELECT c.id, c.title, c.description, c.address, "
+    f"TRIM(COALESCE({ARCHIVED_NOTES_FUNCTION}(a.data), '') || ' ' || "
+    "COALESCE((SELECT group_concat(u.notes, ' ') FROM complaints_statusupdate u WHERE u.complaint_id = c.id), '')) "
+    "FROM complaints_complaint c LEFT JOIN complaints_statushistoryarchive a ON a.complaint_id = c.id"
+)
+
+
+def is_supported(conn=None):
+    """The FTS5 index is only kept on SQLite; other backends use the LIKE fallback"""
+    return (conn or connection).vendor == 'sqlite'
+
+
+def register_functions(conn):
+    """Add archived_notes() to a new SQLite connection for POPULATE_SQL"""
+    if is_supported(conn):
+        conn.connection.create_function(ARCHIVED_NOTES_FUNCTION, 1, _archived_notes, deterministic=True)
+
+
+def _archived_notes(data):
+    return None if data is None else archived_notes(data)
+
+
+def search_terms(query):
+    """Split a user query into word tokens"""
+    return re.findall(r'\w+', query.lower())
+
+
+def match_expression(terms):
+    """FTS5 MATCH expression requiring every term, each as a prefix"""
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def index_complaint(complaint_id):
+    """Write one complaint's current text into the search index"""
+    if not is_supported():
+        return
+    complaint = Complaint.objects.filter(pk=complaint_id).values('title', 'description', 'address').first()
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [complaint_id])
+        if complaint is None:
+            return
+        archives = StatusHistoryArchive.objects.filter(complaint_id=complaint_id).values_list('data', flat=True)
+        notes = ' '.join([
+            *map(archived_notes, archives),
+            *StatusUpdate.objects.filter(complaint_id=complaint_id).values_list('notes', flat=True),
+        ])
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE}(rowid, title, description, address, notes) VALUES (%s, %s, %s, %s, %s)",
+            [complaint_id, complaint['title'], complaint['description'], complaint['address'], notes],
+        )
+
+
+def index_complaints(complaint_ids):
+    """Write many complaints into the search index with two statements"""
+    if not is_supported() or not complaint_ids:
+        return
+    placeholders = ', '.join(['%s'] * len(complaint_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({placeholders})", list(complaint_ids))
+        cursor.execute(f"{POPULATE_SQL} WHERE c.id IN ({placeholders})", list(complaint_ids))
+
+
+def remove_complaint(complaint_id):
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [complaint_id])
+
+
+def rebuild_index():
+    """Recreate the search index from scratch and return the number of indexed complaints.
+
+    One transaction, so searches keep using the old index until the new one is
+    complete and a failed rebuild leaves the old one in place.
+    """
+    if not is_supported():
+        return 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(DROP_TABLE_SQL)
+        cursor.execute(CREATE_TABLE_SQL)
+        cursor.execute(POPULATE_SQL)
+        cursor.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')")
+        cursor.execute(f"SELECT count(*) FROM {SEARCH_TABLE}")
+        return cursor.fetchone()[0]
+
+
+def search_complaints(query, limit=MAX_RESULTS):
+    """Return complaints matching every term of the query, best matches first"""
+    terms = search_terms(query)
+    if not terms:
+        return []
+
+    if not is_supported():
+        return list(_fallback_search(terms)[:limit])
+
+    weights = ', '.join(str(weight) for weight in COLUMN_WEIGHTS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s "
+            f"ORDER BY bm25({SEARCH_TABLE}, {weights}) LIMIT %s",
+            [match_expression(terms), limit],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+
+    complaints = Complaint.objects.for_cards().in_bulk(ids)
+    return [complaints[pk] for pk in ids if pk in complaints]
+
+
+def _fallback_search(terms):
+    # Archived notes are compressed and only reachable through the FTS index
+    complaints = Complaint.objects.for_cards()
+    for term in terms:
+        complaints = complaints.filter(
+            Q(title__icontains=term)
+            | Q(description__icontains=term)
+            | Q(address__icontains=term)
+            | Q(status_updates__notes__icontains=term)
+        )
+    return complaints.distinct().order_by('-created_at')
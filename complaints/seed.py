@@ -0,0 +1,148 @@
+import random
+from datetime import timedelta
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+from .models import Complaint, ComplaintSequence, StatusUpdate
+from .sla import deadline_for
+
+# Relative frequencies used when generating complaints
+CATEGORY_WEIGHTS = {
+    'no_water': 30, 'leak': 25, 'billing': 15, 'pressure': 12,
+    'water_quality': 8, 'meter_issue': 7, 'other': 3,
+}
+PRIORITY_WEIGHTS = {'low': 20, 'medium': 50, 'high': 22, 'critical': 8}
+STATUS_WEIGHTS = {'submitted': 10, 'in_progress': 15, 'resolved': 45, 'closed': 30}
+
+# Area -> approximate centre (latitude, longitude)
+AREAS = {
+    'Accra Central': (5.6037, -0.1870), 'Tema': (5.6698, -0.0166), 'Kumasi': (6.6885, -1.6244),
+    'Madina': (5.6836, -0.1636), 'Kasoa': (5.5340, -0.4168), 'Takoradi': (4.8845, -1.7554),
+    'Tamale': (9.4008, -0.8393), 'Cape Coast': (5.1053, -1.2466),
+}
+# Share of complaints reported with GPS coordinates, and their spread around the area centre in degrees
+GPS_SHARE = 0.8
+GPS_SPREAD = 0.03
+
+
+def _weighted(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _gps_coordinates(rng, area):
+    if rng.random() >= GPS_SHARE:
+        return None
+    latitude, longitude = AREAS[area]
+    return f'{latitude + rng.uniform(-GPS_SPREAD, GPS_SPREAD):.6f}, {longitude + rng.uniform(-GPS_SPREAD, GPS_SPREAD):.6f}'
+
+
+def seed_data(complaints=1000, staff=10, customers=None, days=365, updates=True, batch_size=1000, seed=None):
+    """Bulk-insert users, complaints and status updates with realistic distributions.
+
+    Returns a dict with the number of rows created per kind.
+    """
+    from users.models import User
+    from .dedup import rebuild_fingerprints
+    from .performance import rebuild
+    from .search import rebuild_index
+    from .trends import rebuild as rebuild_trends
+
+    rng = random.Random(seed)
+    customers = customers or max(1, complaints // 5)
+    now = timezone.now()
+    tag = f"{now:%Y%m%d%H%M%S}{rng.randrange(1000):03d}"
+    password = make_password(None)
+
+    with transaction.atomic():
+        staff_users = User.objects.bulk_create(
+            [User(username=f'seed_staff_{tag}_{i}', role='staff', password=password) for i in range(staff)],
+            batch_size=batch_size,
+        )
+        customer_users = User.objects.bulk_create(
+            [
+                User(username=f'seed_customer_{tag}_{i}', role='customer', password=password, address=rng.choice(list(AREAS)))
+                for i in range(customers)
+            ],
+            batch_size=batch_size,
+        )
+        manager = User.objects.create(username=f'seed_manager_{tag}', role='manager', password=password)
+
+        # Spread creation times over the window, oldest first
+        created = sorted(now - timedelta(seconds=rng.uniform(0, days * 86400)) for _ in range(complaints))
+        by_year = {}
+        for created_at in created:
+            by_year[created_at.year] = by_year.get(created_at.year, 0) + 1
+        numbers = {year: iter(ComplaintSequence.reserve(year, count)) for year, count in by_year.items()}
+
+        rows = []
+        for created_at in created:
+            status = _weighted(rng, STATUS_WEIGHTS)
+            category = _weighted(rng, CATEGORY_WEIGHTS)
+            customer = rng.choice(customer_users)
+            resolved_at = None
+            if status in ['resolved', 'closed']:
+                resolved_at = min(now, created_at + timedelta(hours=rng.lognormvariate(3, 1)))
+            assigned = status != 'submitted' or rng.random() < 0.3
+            priority = _weighted(rng, PRIORITY_WEIGHTS)
+            complaint = Complaint(
+                complaint_id=Complaint.format_complaint_id(created_at.year, next(numbers[created_at.year])),
+                customer=customer,
+                assigned_to=rng.choice(staff_users) if assigned and staff_users else None,
+                category=category,
+                priority=priority,
+                status=status,
+                title=f"{dict(Complaint.CATEGORY_CHOICES)[category]} in {customer.address}",
+                description=f"Reported {dict(Complaint.CATEGORY_CHOICES)[category].lower()} affecting the area around {customer.address}.",
+                address=customer.address,
+                gps_coordinates=_gps_coordinates(rng, customer.address),
+                created_at=created_at,
+                resolved_at=resolved_at,
+                sla_deadline=deadline_for(created_at, priority, category),
+                customer_rating=rng.randint(1, 5) if resolved_at and rng.random() < 0.4 else None,
+            )
+            complaint.set_location()
+            rows.append(complaint)
+        rows = Complaint.objects.bulk_create(rows, batch_size=batch_size)
+
+        history = []
+        if updates:
+            for complaint in rows:
+                history.extend(_status_history(rng, complaint, manager))
+            StatusUpdate.objects.bulk_create(history, batch_size=batch_size)
+
+        # bulk_create skips Complaint.save() and its signals, so rebuild the rollups,
+        # the search index and the duplicate fingerprints
+        rebuild([user.pk for user in staff_users])
+        if created:
+            rebuild_trends(since=timezone.localdate(created[0]))
+        rebuild_index()
+        rebuild_fingerprints()
+
+    return {
+        'staff': len(staff_users),
+        'customers': len(customer_users),
+        'complaints': len(rows),
+        'status_updates': len(history),
+    }
+
+
+def _status_history(rng, complaint, manager):
+    """Status updates leading a complaint from submitted to its current status"""
+    path = ['submitted', 'in_progress', 'resolved', 'closed']
+    steps = path[1:path.index(complaint.status) + 1]
+    end = complaint.resolved_at or timezone.now()
+    updated_by = complaint.assigned_to or manager
+    history = []
+    old_status = 'submitted'
+    for i, new_status in enumerate(steps, start=1):
+        created_at = complaint.created_at + (end - complaint.created_at) * i / len(steps)
+        history.append(StatusUpdate(
+            complaint=complaint,
+            updated_by=updated_by,
+            old_status=old_status,
+            new_status=new_status,
+            notes=f'Status changed to {new_status}',
+            created_at=created_at,
+        ))
+        old_status = new_status
+    return history
@@ -0,0 +1,104 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .cache import PUBLIC_DASHBOARD, invalidate
+from .models import AssignmentProfile, Complaint, StatusUpdate
+from . import assignment, dedup, events, performance, profiling, search, trends
+
+
+@receiver(post_save, sender=Complaint)
+@receiver(post_delete, sender=Complaint)
+@receiver(post_save, sender=StatusUpdate)
+@receiver(post_delete, sender=StatusUpdate)
+def invalidate_public_dashboard(sender, **kwargs):
+    """Mark the cached public dashboard stale once the change is committed"""
+    transaction.on_commit(lambda: invalidate(PUBLIC_DASHBOARD))
+
+
+@receiver(post_save, sender=Complaint)
+def index_complaint(sender, instance, **kwargs):
+    """Keep the full-text search index in sync with complaint text"""
+    search.index_complaint(instance.pk)
+
+
+@receiver(post_delete, sender=Complaint)
+def unindex_complaint(sender, instance, **kwargs):
+    search.remove_complaint(instance.pk)
+
+
+@receiver(post_save, sender=StatusUpdate)
+@receiver(post_delete, sender=StatusUpdate)
+def index_status_notes(sender, instance, **kwargs):
+    """Status update notes are searchable as part of their complaint"""
+    search.index_complaint(instance.complaint_id)
+
+
+@receiver(post_save, sender=Complaint)
+def fingerprint_complaint(sender, instance, created, **kwargs):
+    """Link new complaints to an open incident they duplicate; closed ones stop collecting duplicates"""
+    if created:
+        dedup.register_complaint(instance)
+    else:
+        dedup.update_fingerprints(instance, getattr(instance, '_stored_state', None), kwargs.get('update_fields'))
+
+
+@receiver(post_save, sender=Complaint)
+def count_submission(sender, instance, created, **kwargs):
+    if created:
+        trends.record_submissions([instance])
+
+
+@receiver(post_delete, sender=Complaint)
+def remove_from_staff_performance(sender, instance, **kwargs):
+    """Take a deleted complaint out of its assignee's rollup, also for queryset, admin and cascade deletes"""
+    performance.apply_change(performance.tracked_state(instance), None)
+
+
+@receiver(post_save, sender=StatusUpdate)
+def count_status_update(sender, instance, created, **kwargs):
+    """Add each status change to the daily trend rollup"""
+    if created:
+        trends.record_updates([instance])
+
+
+@receiver(post_save, sender=Complaint)
+def publish_complaint_event(sender, instance, created, **kwargs):
+    """Push new submissions, assignments and status changes to open dashboards"""
+    previous = getattr(instance, '_stored_state', None)
+    event = events.complaint_event(
+        'created' if created else 'updated', instance, previous['assigned_to_id'] if previous else None,
+    )
+    transaction.on_commit(lambda: events.publish(event))
+
+
+@receiver(post_save, sender=Complaint)
+def auto_assign_complaint(sender, instance, created, **kwargs):
+    """Route new submissions to the least-loaded eligible staff when enabled"""
+    if created and getattr(settings, 'AUTO_ASSIGN_ON_SUBMIT', False) and instance.assigned_to_id is None:
+        pk = instance.pk
+        transaction.on_commit(lambda: assignment.assign_submitted(pk))
+
+
+@receiver(post_save, sender=AssignmentProfile)
+@receiver(post_delete, sender=AssignmentProfile)
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def reload_assignment_engine(sender, update_fields=None, **kwargs):
+    """Make the shared auto-assignment engine reload after staff or their profiles change"""
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    assignment.shared_engine.invalidate()
+
+
+@receiver(connection_created)
+def register_search_functions(sender, connection, **kwargs):
+    search.register_functions(connection)
+
+
+@receiver(connection_created)
+def install_query_profiler(sender, connection, **kwargs):
+    """Let QueryProfilingMiddleware count queries on every connection, whichever thread opens it"""
+    if getattr(settings, 'REQUEST_PROFILING', True):
+        profiling.install(connection)
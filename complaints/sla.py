@@ -0,0 +1,62 @@
+from datetime import timedelta
+from django.conf import settings
+
+# Hours allowed before an open complaint is overdue, used when settings don't override them
+DEFAULT_SLA_HOURS = {'critical': 12, 'high': 24, 'medium': 48, 'low': 72}
+
+
+def sla_hours(priority, category=None):
+    """Hours allowed for a complaint; a category policy applies when it is stricter"""
+    priority_hours = getattr(settings, 'COMPLAINT_SLA_HOURS', DEFAULT_SLA_HOURS)
+    category_hours = getattr(settings, 'COMPLAINT_SLA_CATEGORY_HOURS', {})
+    hours = priority_hours.get(priority, priority_hours.get('medium', 48))
+    if category in category_hours:
+        hours = min(hours, category_hours[category])
+    return hours
+
+
+def deadline_for(created_at, priority, category=None):
+    return created_at + timedelta(hours=sla_hours(priority, category))
+
+
+def backfill_deadlines(model, only_missing=False):
+    """Set sla_deadline from created_at with one UPDATE per priority/category pair.
+
+    Takes the model class so data migrations can pass their historical model.
+    """
+    from django.db.models import DurationField, ExpressionWrapper, F, Value
+
+    priorities = [value for value, label in model._meta.get_field('priority').choices]
+    categories = [value for value, label in model._meta.get_field('category').choices]
+    updated = 0
+    for priority in priorities:
+        for category in categories:
+            complaints = model.objects.filter(priority=priority, category=category)
+            if only_missing:
+                complaints = complaints.filter(sla_deadline__isnull=True)
+            hours = Value(timedelta(hours=sla_hours(priority, category)), output_field=DurationField())
+            updated += complaints.update(
+                sla_deadline=ExpressionWrapper(F('created_at') + hours, output_field=model._meta.get_field('sla_deadline'))
+            )
+    return updated
+
+
+def deadline_expression(model, priority):
+    """SQL expression for sla_deadline after a change to ``priority``, per row category"""
+    from django.db.models import Case, DurationField, ExpressionWrapper, F, Value, When
+
+    field = model._meta.get_field('sla_deadline')
+    categories = [value for value, label in model._meta.get_field('category').choices]
+    by_hours = {}
+    for category in categories:
+        by_hours.setdefault(sla_hours(priority, category), []).append(category)
+
+    def deadline(hours):
+        delta = Value(timedelta(hours=hours), output_field=DurationField())
+        return ExpressionWrapper(F('created_at') + delta, output_field=field)
+
+    return Case(
+        *[When(category__in=group, then=deadline(hours)) for hours, group in by_hours.items()],
+        default=deadline(sla_hours(priority)),
+        output_field=field,
+    )
@@ -0,0 +1,75 @@
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Q
+from django.utils import timezone
+from .models import Complaint, StaffPerformance
+
+OPEN_STATUSES = ['submitted', 'in_progress']
+CLOSED_STATUSES = ['resolved', 'closed']
+
+
+def month_start(now=None):
+    """Return midnight on the first day of the current month"""
+    now = now or timezone.now()
+    return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def complaint_statistics(queryset=None):
+    """Compute dashboard statistics with a single aggregate query"""
+    if queryset is None:
+        queryset = Complaint.objects.all()
+
+    now = timezone.now()
+    this_month = month_start(now)
+    resolution_time = ExpressionWrapper(F('resolved_at') - F('created_at'), output_field=DurationField())
+
+    stats = queryset.order_by().aggregate(
+        total_complaints=Count('id'),
+        submitted=Count('id', filter=Q(status='submitted')),
+        in_progress=Count('id', filter=Q(status='in_progress')),
+        resolved=Count('id', filter=Q(status='resolved')),
+        closed=Count('id', filter=Q(status='closed')),
+        unassigned=Count('id', filter=Q(assigned_to__isnull=True)),
+        complaints_this_month=Count('id', filter=Q(created_at__gte=this_month)),
+        resolved_this_month=Count('id', filter=Q(resolved_at__gte=this_month)),
+        overdue_count=Count('id', filter=Q(status__in=OPEN_STATUSES, sla_deadline__lt=now)),
+        avg_resolution=Avg(resolution_time, filter=Q(status__in=CLOSED_STATUSES, resolved_at__isnull=False)),
+    )
+
+    # Average resolution time (in hours)
+    avg_resolution = stats.pop('avg_resolution')
+    stats['avg_resolution_time'] = round(avg_resolution.total_seconds() / 3600, 2) if avg_resolution is not None else None
+
+    return stats
+
+
+def category_breakdown(total=None, queryset=None):
+    """Complaint counts per category, largest first, with percentages of the total"""
+    if queryset is None:
+        queryset = Complaint.objects.all()
+
+    rows = list(queryset.order_by().values('category').annotate(count=Count('id')).order_by('-count'))
+    if total is None:
+        total = sum(row['count'] for row in rows)
+
+    labels = dict(Complaint.CATEGORY_CHOICES)
+    return [
+        {
+            'category': row['category'],
+            'label': labels.get(row['category'], row['category']),
+            'count': row['count'],
+            'percentage': round((row['count'] / total * 100), 2) if total > 0 else 0,
+        }
+        for row in rows
+    ]
+
+
+def staff_with_performance():
+    """Staff members with their performance rollup attached as ``rollup``"""
+    from users.models import User
+
+    staff_members = list(User.objects.filter(role='staff').select_related('performance'))
+    for staff in staff_members:
+        try:
+            staff.rollup = staff.performance
+        except StaffPerformance.DoesNotExist:
+            staff.rollup = StaffPerformance(staff=staff)
+    return staff_members
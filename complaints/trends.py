@@ -0,0 +1,208 @@
+from collections import Counter
+from datetime import datetime, time, timedelta
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from .archive import archived_updates
+from .models import Complaint, DailyComplaintStat, StatusHistoryArchive, StatusUpdate
+from .stats import CLOSED_STATUSES
+
+# Periods start on the day itself, the Monday of its week or the first of its month
+PERIODS = {
+    'day': lambda day: day,
+    'week': lambda day: day - timedelta(days=day.weekday()),
+    'month': lambda day: day.replace(day=1),
+}
+GROUPS = {'category': 'category', 'staff': 'staff_id'}
+COUNTER_FIELDS = ['entered', 'resolved', 'sla_breached', 'resolution_hours_total']
+
+
+def _local_date(value):
+    # Rows are dated in the site time zone, as TruncDate does in rebuild()
+    return timezone.localdate(value)
+
+
+def submission_counters(complaint):
+    return (_local_date(complaint.created_at), complaint.category, 'submitted', None), {'entered': 1}
+
+
+def update_counters(update, complaint):
+    """Rollup key and counters for one status update of ``complaint`` (a values() row).
+
+    The update is credited to the user who made it, which a rebuild can still tell from history.
+    """
+    counters = {'entered': 1}
+    if update.new_status in CLOSED_STATUSES and update.old_status not in CLOSED_STATUSES:
+        counters['resolved'] = 1
+        counters['resolution_hours_total'] = (update.created_at - complaint['created_at']).total_seconds() / 3600
+        if complaint['sla_deadline'] and update.created_at > complaint['sla_deadline']:
+            counters['sla_breached'] = 1
+    key = (_local_date(update.created_at), complaint['category'], update.new_status, update.updated_by_id)
+    return key, counters
+
+
+def record_submissions(complaints):
+    _increment([submission_counters(complaint) for complaint in complaints])
+
+
+def record_updates(updates):
+    """Add status updates to the rollup with one query for their complaints"""
+    if not updates:
+        return
+    complaints = Complaint.objects.filter(pk__in={update.complaint_id for update in updates}).values(
+        'pk', 'category', 'created_at', 'sla_deadline'
+    )
+    by_pk = {row['pk']: row for row in complaints}
+    _increment([update_counters(update, by_pk[update.complaint_id]) for update in updates])
+
+
+def _increment(entries):
+    """Add counters to their rollup rows: one read, one bulk update and one bulk insert"""
+    totals = {}
+    for key, counters in entries:
+        totals.setdefault(key, Counter()).update(counters)
+    if not totals:
+        return
+
+    match = Q()
+    for date, category, status, staff_id in totals:
+        match |= Q(date=date, category=category, status=status, staff_id=staff_id)
+    existing = list(DailyComplaintStat.objects.filter(match))
+    for row in existing:
+        counters = totals.pop((row.date, row.category, row.status, row.staff_id))
+        for field in COUNTER_FIELDS:
+            setattr(row, field, F(field) + counters[field])
+    DailyComplaintStat.objects.bulk_update(existing, COUNTER_FIELDS)
+    if not totals:
+        return
+
+    try:
+        with transaction.atomic():
+            DailyComplaintStat.objects.bulk_create([
+                DailyComplaintStat(date=date, category=category, status=status, staff_id=staff_id, **counters)
+                for (date, category, status, staff_id), counters in totals.items()
+            ])
+    except IntegrityError:
+        # Another request created some of the rows first
+        for key, counters in totals.items():
+            _apply(key, counters)
+
+
+def _apply(key, counters):
+    date, category, status, staff_id = key
+    rows = DailyComplaintStat.objects.filter(date=date, category=category, status=status, staff_id=staff_id)
+    changes = {field: F(field) + value for field, value in counters.items()}
+    if not rows.update(**changes):
+        DailyComplaintStat.objects.create(date=date, category=category, status=status, staff_id=staff_id, **counters)
+
+
+def rebuild(since=None):
+    """Recompute the rollup from complaints and status updates, all of it or from date ``since``"""
+    complaints = Complaint.objects.all()
+    updates = StatusUpdate.objects.all()
+    archives = StatusHistoryArchive.objects.all()
+    existing = DailyComplaintStat.objects.all()
+    start = None
+    if since is not None:
+        start = timezone.make_aware(datetime.combine(since, time.min))
+        complaints = complaints.filter(created_at__gte=start)
+        updates = updates.filter(created_at__gte=start)
+        archives = archives.filter(last_update_at__gte=start)
+        existing = existing.filter(date__gte=since)
+
+    rows = {}
+    submissions = complaints.order_by().values(day=TruncDate('created_at'), cat=F('category')).annotate(count=Count('id'))
+    for row in submissions:
+        rows[(row['day'], row['cat'], 'submitted', None)] = DailyComplaintStat(
+            date=row['day'], category=row['cat'], status='submitted', entered=row['count'],
+        )
+
+    resolving = Q(new_status__in=CLOSED_STATUSES) & ~Q(old_status__in=CLOSED_STATUSES)
+    resolution_time = ExpressionWrapper(F('created_at') - F('complaint__created_at'), output_field=DurationField())
+    transitions = updates.order_by().values(
+        day=TruncDate('created_at'),
+        cat=F('complaint__category'),
+        status=F('new_status'),
+        staff=F('updated_by_id'),
+    ).annotate(
+        entered=Count('id'),
+        resolved=Count('id', filter=resolving),
+        sla_breached=Count('id', filter=resolving & Q(created_at__gt=F('complaint__sla_deadline'))),
+        resolution_time=Sum(resolution_time, filter=resolving),
+    )
+    for row in transitions:
+        key = (row['day'], row['cat'], row['status'], row['staff'])
+        stat = rows.setdefault(key, DailyComplaintStat(
+            date=row['day'], category=row['cat'], status=row['status'], staff_id=row['staff'],
+        ))
+        stat.entered += row['entered']
+        stat.resolved += row['resolved']
+        stat.sla_breached += row['sla_breached']
+        if row['resolution_time']:
+            stat.resolution_hours_total += row['resolution_time'].total_seconds() / 3600
+
+    # Archived history is unpacked here; it only grows with long-closed complaints
+    archived = archives.select_related('complaint').only(
+        'data', 'complaint__category', 'complaint__created_at', 'complaint__sla_deadline',
+    )
+    for archive in archived.iterator(chunk_size=500):
+        complaint = {
+            field: getattr(archive.complaint, field)
+            for field in ['category', 'created_at', 'sla_deadline']
+        }
+        for update in archived_updates(archive, users={}):
+            if start is not None and update.created_at < start:
+                continue
+            (day, category, status, staff_id), counters = update_counters(update, complaint)
+            stat = rows.setdefault((day, category, status, staff_id), DailyComplaintStat(
+                date=day, category=category, status=status, staff_id=staff_id,
+            ))
+            for field, value in counters.items():
+                setattr(stat, field, getattr(stat, field) + value)
+
+    with transaction.atomic():
+        existing.delete()
+        DailyComplaintStat.objects.bulk_create(rows.values(), batch_size=1000)
+    return len(rows)
+
+
+def trend_series(start, end, period='day', group_by=None, category=None, staff_id=None):
+    """Submissions, resolutions, SLA breaches and mean resolution hours per period between two dates"""
+    stats = DailyComplaintStat.objects.filter(date__range=(start, end))
+    if category:
+        stats = stats.filter(category=category)
+    if staff_id:
+        stats = stats.filter(staff_id=staff_id)
+
+    # Days are summed in SQL and folded into weeks/months here, which is far cheaper
+    # than truncating every row with a date function SQLite lacks natively
+    columns = ['date', *([GROUPS[group_by]] if group_by else [])]
+    rows = stats.order_by().values(*columns).annotate(
+        submitted=Sum('entered', filter=Q(status='submitted')),
+        resolved=Sum('resolved'),
+        sla_breached=Sum('sla_breached'),
+        resolution_hours=Sum('resolution_hours_total'),
+    )
+
+    start_of = PERIODS[period]
+    buckets = {}
+    for row in rows:
+        key = (start_of(row['date']), row[GROUPS[group_by]] if group_by else None)
+        bucket = buckets.setdefault(key, Counter())
+        bucket.update({field: row[field] or 0 for field in ['submitted', 'resolved', 'sla_breached', 'resolution_hours']})
+
+    results = []
+    for (start, group), bucket in sorted(buckets.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+        resolved = bucket['resolved']
+        result = {
+            'period': start,
+            'submitted': bucket['submitted'],
+            'resolved': resolved,
+            'sla_breached': bucket['sla_breached'],
+            'avg_resolution_hours': round(bucket['resolution_hours'] / resolved, 2) if resolved else None,
+        }
+        if group_by:
+            result[group_by] = group
+        results.append(result)
+    return results
@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import api, views
 
 urlpatterns = [
     # Public
@@ -15,10 +15,23 @@ urlpatterns = [
     path('staff/unassigned/', views.unassigned_complaints, name='unassigned_complaints'),
     path('complaint/<str:complaint_id>/update/', views.update_complaint_status, name='update_complaint_status'),
     path('complaint/<str:complaint_id>/assign/', views.assign_complaint, name='assign_complaint'),
+    path('complaints/bulk/assign/', views.bulk_assign_complaints, name='bulk_assign_complaints'),
+    path('complaints/bulk/status/', views.bulk_update_complaint_status, name='bulk_update_complaint_status'),
+    path('search/', views.search_complaints, name='search_complaints'),
+    path('staff/live/', views.live_updates, name='live_updates'),
 
     # Manager
     path('manager/', views.manager_dashboard, name='manager_dashboard'),
     path('manager/all-complaints/', views.all_complaints, name='all_complaints'),
     path('manager/staff-performance/', views.staff_performance, name='staff_performance'),
     path('manager/export/', views.export_complaints, name='export_complaints'),
+    path('manager/profiling/', views.profiling_report, name='profiling_report'),
+
+    # JSON API
+    path('api/complaints/nearby/', api.complaints_nearby, name='api_complaints_nearby'),
+    path('api/complaints/hotspots/', api.complaint_hotspots, name='api_complaint_hotspots'),
+    path('api/trends/', api.complaint_trends, name='api_complaint_trends'),
+    path('api/complaints/', api.complaint_list, name='api_complaint_list'),
+    path('api/complaints/<str:complaint_id>/', api.complaint_status, name='api_complaint_status'),
+    path('api/complaints/<str:complaint_id>/history/', api.complaint_history, name='api_complaint_history'),
 ]
@@ -1,57 +1,55 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
-from django.db.models import Count, Avg, Q
-from django.utils import timezone
-from datetime import timedelta
-from .models import Complaint, StatusUpdate
-from .forms import Complaint, ComplaintForm, ComplaintRatingForm, StatusUpdateForm, ComplaintAssignmentForm
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.views.decorators.http import require_POST
+from django.db.models import Count, Q
+from .models import Complaint, StatusHistoryArchive, StatusUpdate
+from .forms import Complaint, ComplaintForm, ComplaintRatingForm, StatusUpdateForm, ComplaintAssignmentForm, BulkAssignmentForm, BulkStatusForm
+from .filters import filter_complaints
+from .export import parse_columns, acsv_rows, csv_rows
+from .pagination import paginate
+from .cache import PUBLIC_DASHBOARD, cached_section
+from .search import search_complaints as find_complaints
+from .images import queue_image
+from .events import stream as live_event_stream
+from .bulk import MAX_BULK_COMPLAINTS, bulk_assign, bulk_update_status
+from .archive import full_history
+from .fragments import card_version, render_rows, render_timeline
+from .profiling import summary as profiling_summary
+from .replicas import read_from_replica
+from .stats import complaint_statistics, category_breakdown, staff_with_performance
 from django.contrib import messages
 
+@read_from_replica
 def public_dashboard(request):
     """Public dashboard showing overall statistics"""
     
-    # Total complaints
-    total_complaints = Complaint.objects.count()
-    
-    # Status breakdown
-    submitted = Complaint.objects.filter(status='submitted').count()
-    in_progress = Complaint.objects.filter(status='in_progress').count()
-    resolved = Complaint.objects.filter(status='resolved').count()
-    closed = Complaint.objects.filter(status='closed').count()
-    
-    # Calculate average resolution time (in hours)
-    resolved_complaints = Complaint.objects.filter(status__in=['resolved', 'closed']).exclude(resolved_at=None)
-    avg_resolution_time = None
-    if resolved_complaints.exists():
-        total_time = sum([c.response_time for c in resolved_complaints if c.response_time])
-        avg_resolution_time = round(total_time / resolved_complaints.count(), 2) if resolved_complaints.count() > 0 else 0
+    # Sections are cached and recomputed by one worker at a time after a change
+    stats = cached_section(PUBLIC_DASHBOARD, 'stats', complaint_statistics)
     
     # Complaints by category
-    complaints_by_category = Complaint.objects.values('category').annotate(
-        count=Count('id')
-    ).order_by('-count')
+    complaints_by_category = cached_section(
+        PUBLIC_DASHBOARD, 'categories', lambda: category_breakdown(stats['total_complaints'])
+    )
     
     # Recent complaints (last 5)
-    recent_complaints = Complaint.objects.all()[:5]
-    
-    # Complaints this month
-    this_month = timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    complaints_this_month = Complaint.objects.filter(created_at__gte=this_month).count()
-    
-    # Overdue complaints
-    overdue_count = sum(1 for c in Complaint.objects.filter(status__in=['submitted', 'in_progress']) if c.is_overdue)
+    recent_complaints = cached_section(
+        PUBLIC_DASHBOARD, 'recent', lambda: list(Complaint.objects.for_table()[:5])
+    )
     
     context = {
-        'total_complaints': total_complaints,
-        'submitted': submitted,
-        'in_progress': in_progress,
-        'resolved': resolved,
-        'closed': closed,
-        'avg_resolution_time': avg_resolution_time,
+        'total_complaints': stats['total_complaints'],
+        'submitted': stats['submitted'],
+        'in_progress': stats['in_progress'],
+        'resolved': stats['resolved'],
+        'closed': stats['closed'],
+        'avg_resolution_time': stats['avg_resolution_time'],
         'complaints_by_category': complaints_by_category,
         'recent_complaints': recent_complaints,
-        'complaints_this_month': complaints_this_month,
-        'overdue_count': overdue_count,
+        'complaints_this_month': stats['complaints_this_month'],
+        'overdue_count': stats['overdue_count'],
     }
     
     return render(request, 'complaints/public_dashboard.html', context)
@@ -72,8 +70,12 @@ def submit_complaint(request):
             complaint = form.save(commit=False)
             complaint.customer = request.user
             complaint.save()
+            if form.cleaned_data.get('image'):
+                queue_image(complaint, form.cleaned_data['image'])
             
             messages.success(request, f'Complaint submitted successfully! Your complaint ID is {complaint.complaint_id}')
+            if complaint.parent_id:
+                messages.info(request, 'Your complaint matches an incident already reported nearby and has been linked to it.')
             return redirect('my_complaints')
     else:
         form = ComplaintForm()
@@ -88,15 +90,17 @@ def my_complaints(request):
         messages.error(request, 'Only customers can view this page.')
         return redirect('dashboard')
     
-    complaints = Complaint.objects.filter(customer=request.user).order_by('-created_at')
+    complaints = Complaint.objects.for_cards().filter(customer=request.user).order_by('-created_at')
     
     # Filter by status if provided
     status_filter = request.GET.get('status', None)
     if status_filter:
         complaints = complaints.filter(status=status_filter)
     
+    page = paginate(complaints, request.GET)
     context = {
-        'complaints': complaints,
+        'complaints': page,
+        'complaint_rows': render_rows('complaints/_my_complaint_card.html', page, version=card_version),
         'status_filter': status_filter,
     }
     
@@ -106,15 +110,28 @@ def my_complaints(request):
 @login_required
 def complaint_detail(request, complaint_id):
     """View detailed complaint information with status history"""
-    complaint = get_object_or_404(Complaint, complaint_id=complaint_id)
+    complaint = get_object_or_404(
+        Complaint.objects.select_related('image_upload__asset'), complaint_id=complaint_id
+    )
     
     # Check permissions
     if request.user.is_customer() and complaint.customer != request.user:
         messages.error(request, 'You can only view your own complaints.')
         return redirect('my_complaints')
     
-    # Get status updates
-    status_updates = complaint.status_updates.all()
+    # Get status updates; archived ones are only unpacked on request
+    status_updates = complaint.status_updates.select_related('updated_by')
+    archived_count = (
+        StatusHistoryArchive.objects.filter(complaint=complaint).values_list('update_count', flat=True).first() or 0
+    )
+    show_archived = bool(archived_count) and request.GET.get('history') == 'full'
+    if show_archived:
+        status_updates = full_history(complaint)
+    
+    # Same-incident reports (staff and managers only)
+    duplicate_count = None
+    if not request.user.is_customer():
+        duplicate_count = complaint.duplicates.count()
     
     # Handle rating form (only for resolved complaints by the customer)
     rating_form = None
@@ -130,7 +147,10 @@ def complaint_detail(request, complaint_id):
     
     context = {
         'complaint': complaint,
-        'status_updates': status_updates,
+        'timeline': render_timeline(complaint, status_updates, archived_count, show_archived),
+        'archived_count': archived_count,
+        'show_archived': show_archived,
+        'duplicate_count': duplicate_count,
         'rating_form': rating_form,
     }
     
@@ -147,7 +167,7 @@ def staff_dashboard(request):
         return redirect('dashboard')
     
     # Get assigned complaints
-    assigned_complaints = Complaint.objects.filter(assigned_to=request.user).order_by('-created_at')
+    assigned_complaints = Complaint.objects.for_cards().filter(assigned_to=request.user).order_by('-created_at')
     
     # Filter by status
     status_filter = request.GET.get('status', None)
@@ -155,21 +175,25 @@ def staff_dashboard(request):
         assigned_complaints = assigned_complaints.filter(status=status_filter)
     
     # Statistics
-    total_assigned = assigned_complaints.count()
-    in_progress = assigned_complaints.filter(status='in_progress').count()
-    resolved = assigned_complaints.filter(status='resolved').count()
-    pending = assigned_complaints.filter(status='submitted').count()
+    counts = assigned_complaints.order_by().aggregate(
+        total_assigned=Count('id'),
+        in_progress=Count('id', filter=Q(status='in_progress')),
+        resolved=Count('id', filter=Q(status='resolved')),
+        pending=Count('id', filter=Q(status='submitted')),
+    )
     
     # Get unassigned complaints (for staff to pick up)
-    unassigned_complaints = Complaint.objects.filter(assigned_to__isnull=True, status='submitted').order_by('-created_at')[:5]
+    unassigned_complaints = Complaint.objects.unassigned().for_table().order_by('-created_at')[:5]
     
+    page = paginate(assigned_complaints, request.GET)
     context = {
-        'assigned_complaints': assigned_complaints,
+        'assigned_complaints': page,
+        'assigned_rows': render_rows('complaints/_assigned_complaint_card.html', page),
         'unassigned_complaints': unassigned_complaints,
-        'total_assigned': total_assigned,
-        'in_progress': in_progress,
-        'resolved': resolved,
-        'pending': pending,
+        'total_assigned': counts['total_assigned'],
+        'in_progress': counts['in_progress'],
+        'resolved': counts['resolved'],
+        'pending': counts['pending'],
         'status_filter': status_filter,
     }
     
@@ -268,6 +292,66 @@ def assign_complaint(request, complaint_id):
     return render(request, 'complaints/assign_complaint.html', context)
 
 
+def _redirect_back(request, default):
+    """Redirect to the list a bulk action was posted from"""
+    next_url = request.POST.get('next')
+    if next_url and url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}):
+        return redirect(next_url)
+    return redirect(default)
+
+
+@login_required
+@require_POST
+def bulk_assign_complaints(request):
+    """Assign or reprioritise the selected complaints in one transaction"""
+    if not request.user.is_manager() and not request.user.is_staff_member():
+        messages.error(request, 'You do not have permission to assign complaints.')
+        return redirect('dashboard')
+    
+    complaint_ids = request.POST.getlist('complaints')
+    if not complaint_ids:
+        messages.error(request, 'Select at least one complaint.')
+        return _redirect_back(request, 'unassigned_complaints')
+    
+    if request.user.is_manager():
+        form = BulkAssignmentForm(request.POST)
+        if not form.is_valid() or not (form.cleaned_data['assigned_to'] or form.cleaned_data['priority']):
+            messages.error(request, 'Choose a staff member or a priority to apply.')
+            return _redirect_back(request, 'all_complaints')
+        count = bulk_assign(request.user, complaint_ids, form.cleaned_data['assigned_to'], form.cleaned_data['priority'])
+    else:
+        count = bulk_assign(request.user, complaint_ids)
+    
+    skipped = min(len(complaint_ids), MAX_BULK_COMPLAINTS) - count
+    messages.success(request, f'Updated {count} complaint(s).')
+    if skipped:
+        messages.warning(request, f'{skipped} complaint(s) were skipped because you cannot assign them.')
+    return _redirect_back(request, 'unassigned_complaints')
+
+
+@login_required
+@require_POST
+def bulk_update_complaint_status(request):
+    """Change the status of the selected complaints in one transaction"""
+    if not request.user.is_staff_member() and not request.user.is_manager():
+        messages.error(request, 'You do not have permission to update complaints.')
+        return redirect('dashboard')
+    
+    complaint_ids = request.POST.getlist('complaints')
+    form = BulkStatusForm(request.POST)
+    if not complaint_ids or not form.is_valid():
+        messages.error(request, 'Select complaints, a new status and add update notes.')
+        return _redirect_back(request, 'dashboard')
+    
+    count = bulk_update_status(request.user, complaint_ids, form.cleaned_data['new_status'], form.cleaned_data['notes'])
+    
+    skipped = min(len(complaint_ids), MAX_BULK_COMPLAINTS) - count
+    messages.success(request, f'Updated the status of {count} complaint(s).')
+    if skipped:
+        messages.warning(request, f'{skipped} complaint(s) were skipped because you cannot update them.')
+    return _redirect_back(request, 'dashboard')
+
+
 @login_required
 def unassigned_complaints(request):
     """View all unassigned complaints"""
@@ -275,18 +359,57 @@ def unassigned_complaints(request):
         messages.error(request, 'You do not have permission to view this page.')
         return redirect('dashboard')
     
-    complaints = Complaint.objects.filter(assigned_to__isnull=True, status='submitted').order_by('-created_at')
+    complaints = Complaint.objects.unassigned().for_cards().order_by('-created_at')
     
+    page = paginate(complaints, request.GET)
     context = {
-        'complaints': complaints,
+        'complaints': page,
+        'complaint_rows': render_rows('complaints/_unassigned_complaint_card.html', page, version=card_version),
+        'bulk_assign_form': BulkAssignmentForm() if request.user.is_manager() else None,
     }
     
     return render(request, 'complaints/unassigned_complaints.html', context)
 
 
+@login_required
+async def live_updates(request):
+    """Server-sent events for new, reassigned and updated complaints on staff dashboards"""
+    user = await request.auser()
+    if not user.is_staff_member() and not user.is_manager():
+        return HttpResponse(status=403)
+    
+    # Under WSGI a stream would hold a worker thread forever; 204 tells EventSource not to reconnect
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    
+    response = StreamingHttpResponse(live_event_stream(user), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@login_required
+def search_complaints(request):
+    """Ranked full-text search over complaints for staff and managers"""
+    if not request.user.is_staff_member() and not request.user.is_manager():
+        messages.error(request, 'You do not have permission to search complaints.')
+        return redirect('dashboard')
+    
+    query = request.GET.get('q', '').strip()
+    results = find_complaints(query) if query else []
+    
+    context = {
+        'query': query,
+        'results': results,
+    }
+    
+    return render(request, 'complaints/search.html', context)
+
+
 # Manager Views
 
 @login_required
+@read_from_replica
 def manager_dashboard(request):
     """Manager dashboard with analytics and all complaints"""
     if not request.user.is_manager():
@@ -294,7 +417,7 @@ def manager_dashboard(request):
         return redirect('dashboard')
     
     # All complaints
-    all_complaints = Complaint.objects.all().order_by('-created_at')
+    all_complaints = Complaint.objects.for_table().order_by('-created_at')
     
     # Filter by status
     status_filter = request.GET.get('status', None)
@@ -307,75 +430,42 @@ def manager_dashboard(request):
         all_complaints = all_complaints.filter(assigned_to__id=staff_filter)
     
     # Statistics
-    total_complaints = Complaint.objects.count()
-    submitted = Complaint.objects.filter(status='submitted').count()
-    in_progress = Complaint.objects.filter(status='in_progress').count()
-    resolved = Complaint.objects.filter(status='resolved').count()
-    closed = Complaint.objects.filter(status='closed').count()
-    unassigned = Complaint.objects.filter(assigned_to__isnull=True).count()
-    
-    # Average resolution time
-    resolved_complaints = Complaint.objects.filter(status__in=['resolved', 'closed']).exclude(resolved_at=None)
-    avg_resolution_time = None
-    if resolved_complaints.exists():
-        total_time = sum([c.response_time for c in resolved_complaints if c.response_time])
-        avg_resolution_time = round(total_time / resolved_complaints.count(), 2) if resolved_complaints.count() > 0 else 0
+    stats = complaint_statistics()
     
     # Staff performance
-    from users.models import User
-    staff_members = User.objects.filter(role='staff')
-    staff_performance = []
-    for staff in staff_members:
-        staff_complaints = Complaint.objects.filter(assigned_to=staff)
-        staff_resolved = staff_complaints.filter(status__in=['resolved', 'closed']).count()
-        staff_pending = staff_complaints.filter(status__in=['submitted', 'in_progress']).count()
-        
-        staff_performance.append({
+    staff_members = staff_with_performance()
+    staff_performance = [
+        {
             'staff': staff,
-            'total': staff_complaints.count(),
-            'resolved': staff_resolved,
-            'pending': staff_pending,
-            'resolution_rate': round((staff_resolved / staff_complaints.count() * 100), 1) if staff_complaints.count() > 0 else 0
-        })
+            'total': staff.rollup.assigned,
+            'resolved': staff.rollup.resolved,
+            'pending': staff.rollup.open_count,
+            'resolution_rate': staff.rollup.resolution_rate,
+        }
+        for staff in staff_members
+    ]
     
     # Complaints by category
-    from django.db.models import Count
-    complaints_by_category = Complaint.objects.values('category').annotate(
-        count=Count('id')
-    ).order_by('-count')
-    
-    # Calculate percentages
-    category_list = []
-    for item in complaints_by_category:
-        percentage = round((item['count'] / total_complaints * 100), 2) if total_complaints > 0 else 0
-        category_list.append({
-            'category': item['category'],
-            'count': item['count'],
-            'percentage': percentage
-        })
+    category_list = category_breakdown(stats['total_complaints'])
     
-    # Overdue complaints
-    overdue_complaints = [c for c in Complaint.objects.filter(status__in=['submitted', 'in_progress']) if c.is_overdue]
-    
-    # This month statistics
-    this_month = timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    complaints_this_month = Complaint.objects.filter(created_at__gte=this_month).count()
-    resolved_this_month = Complaint.objects.filter(resolved_at__gte=this_month).count()
+    # Overdue complaints (first few for the alert panel)
+    overdue_complaints = Complaint.objects.for_table().overdue().order_by('sla_deadline')[:5]
     
     context = {
-        'all_complaints': all_complaints,
-        'total_complaints': total_complaints,
-        'submitted': submitted,
-        'in_progress': in_progress,
-        'resolved': resolved,
-        'closed': closed,
-        'unassigned': unassigned,
-        'avg_resolution_time': avg_resolution_time,
+        'all_complaints': paginate(all_complaints, request.GET, page_size=10),
+        'total_complaints': stats['total_complaints'],
+        'submitted': stats['submitted'],
+        'in_progress': stats['in_progress'],
+        'resolved': stats['resolved'],
+        'closed': stats['closed'],
+        'unassigned': stats['unassigned'],
+        'avg_resolution_time': stats['avg_resolution_time'],
         'staff_performance': staff_performance,
         'complaints_by_category': category_list,
         'overdue_complaints': overdue_complaints,
-        'complaints_this_month': complaints_this_month,
-        'resolved_this_month': resolved_this_month,
+        'overdue_count': stats['overdue_count'],
+        'complaints_this_month': stats['complaints_this_month'],
+        'resolved_this_month': stats['resolved_this_month'],
         'status_filter': status_filter,
         'staff_filter': staff_filter,
         'staff_members': staff_members,
@@ -385,79 +475,57 @@ def manager_dashboard(request):
 
 
 @login_required
+@read_from_replica
 def all_complaints(request):
     """Manager view of all complaints with filtering"""
     if not request.user.is_manager():
         messages.error(request, 'Only managers can access this page.')
         return redirect('dashboard')
     
-    complaints = Complaint.objects.all().order_by('-created_at')
+    complaints = Complaint.objects.for_table().order_by('-created_at')
     
     # Apply filters
-    status = request.GET.get('status')
-    category = request.GET.get('category')
-    priority = request.GET.get('priority')
-    assigned = request.GET.get('assigned')
-    
-    if status:
-        complaints = complaints.filter(status=status)
-    if category:
-        complaints = complaints.filter(category=category)
-    if priority:
-        complaints = complaints.filter(priority=priority)
-    if assigned == 'yes':
-        complaints = complaints.filter(assigned_to__isnull=False)
-    elif assigned == 'no':
-        complaints = complaints.filter(assigned_to__isnull=True)
+    complaints, filters = filter_complaints(complaints, request.GET)
+    
+    page = paginate(complaints, request.GET)
+    
+    # Counting every match is a full scan, so only the first page shows the total
+    total_count = None
+    if not page.has_previous:
+        total_count = complaints.count() if page.has_next else len(page)
     
     context = {
-        'complaints': complaints,
-        'status_filter': status,
-        'category_filter': category,
-        'priority_filter': priority,
-        'assigned_filter': assigned,
+        'complaints': page,
+        'complaint_rows': render_rows('complaints/_complaint_table_row.html', page),
+        'total_count': total_count,
+        'bulk_assign_form': BulkAssignmentForm(),
+        'bulk_status_form': BulkStatusForm(),
+        **filters,
     }
     
     return render(request, 'complaints/all_complaints.html', context)
 
 
 @login_required
+@read_from_replica
 def staff_performance(request):
     """Detailed staff performance analytics"""
     if not request.user.is_manager():
         messages.error(request, 'Only managers can access this page.')
         return redirect('dashboard')
     
-    from users.models import User
-    staff_members = User.objects.filter(role='staff')
-    
     performance_data = []
-    for staff in staff_members:
-        complaints = Complaint.objects.filter(assigned_to=staff)
-        resolved = complaints.filter(status__in=['resolved', 'closed'])
-        
-        # Calculate average resolution time for this staff
-        avg_time = None
-        if resolved.exists():
-            times = [c.response_time for c in resolved if c.response_time]
-            avg_time = round(sum(times) / len(times), 2) if times else None
-        
-        # Get ratings
-        rated_complaints = resolved.exclude(customer_rating__isnull=True)
-        avg_rating = None
-        if rated_complaints.exists():
-            total_rating = sum([c.customer_rating for c in rated_complaints])
-            avg_rating = round(total_rating / rated_complaints.count(), 1)
-        
+    for staff in staff_with_performance():
+        rollup = staff.rollup
         performance_data.append({
             'staff': staff,
-            'total_assigned': complaints.count(),
-            'resolved': resolved.count(),
-            'in_progress': complaints.filter(status='in_progress').count(),
-            'pending': complaints.filter(status='submitted').count(),
-            'avg_resolution_time': avg_time,
-            'avg_rating': avg_rating,
-            'resolution_rate': round((resolved.count() / complaints.count() * 100), 1) if complaints.count() > 0 else 0
+            'total_assigned': rollup.assigned,
+            'resolved': rollup.resolved,
+            'in_progress': rollup.in_progress,
+            'pending': rollup.pending,
+            'avg_resolution_time': rollup.avg_resolution_time,
+            'avg_rating': rollup.avg_rating,
+            'resolution_rate': rollup.resolution_rate,
         })
     
     context = {
@@ -468,42 +536,37 @@ def staff_performance(request):
 
 
 @login_required
+def profiling_report(request):
+    """Latency percentiles and query counts per view from this process's recent requests"""
+    if not request.user.is_manager():
+        messages.error(request, 'Only managers can access this page.')
+        return redirect('dashboard')
+    
+    context = {
+        'views': profiling_summary(),
+    }
+    
+    return render(request, 'complaints/profiling_report.html', context)
+
+
+@login_required
+@read_from_replica
 def export_complaints(request):
     """Export complaints data as CSV"""
     if not request.user.is_manager():
         messages.error(request, 'Only managers can export data.')
         return redirect('dashboard')
     
-    import csv
-    from django.http import HttpResponse
+    # Same filters as the all complaints page, plus a column subset
+    complaints, filters = filter_complaints(Complaint.objects.all(), request.GET)
+    complaints = complaints.with_users().defer(
+        'description', 'customer_feedback'
+    ).order_by('-created_at')
+    columns = parse_columns(request.GET.getlist('columns'))
     
-    # Create the HttpResponse object with CSV header
-    response = HttpResponse(content_type='text/csv')
+    # Stream rows as they are read so large exports start immediately
+    rows = acsv_rows if isinstance(request, ASGIRequest) else csv_rows
+    response = StreamingHttpResponse(rows(complaints, columns), content_type='text/csv')
     response['Content-Disposition'] = 'attachment; filename="complaints_export.csv"'
     
-    writer = csv.writer(response)
-    writer.writerow([
-        'Complaint ID', 'Title', 'Category', 'Priority', 'Status',
-        'Customer', 'Assigned To', 'Address', 'Created At', 
-        'Resolved At', 'Response Time (hrs)', 'Rating'
-    ])
-    
-    complaints = Complaint.objects.all().order_by('-created_at')
-    
-    for complaint in complaints:
-        writer.writerow([
-            complaint.complaint_id,
-            complaint.title,
-            complaint.get_category_display(),
-            complaint.get_priority_display(),
-            complaint.get_status_display(),
-            complaint.customer.username,
-            complaint.assigned_to.username if complaint.assigned_to else 'Unassigned',
-            complaint.address,
-            complaint.created_at.strftime('%Y-%m-%d %H:%M'),
-            complaint.resolved_at.strftime('%Y-%m-%d %H:%M') if complaint.resolved_at else 'N/A',
-            complaint.response_time if complaint.response_time else 'N/A',
-            complaint.customer_rating if complaint.customer_rating else 'N/A'
-        ])
-    
-    return response
\ No newline at end of file
+    return response
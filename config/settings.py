@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+from .database import databases_from_env
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -49,6 +50,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'complaints.middleware.QueryProfilingMiddleware',
+    'complaints.middleware.ReplicaPinMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -74,12 +77,14 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
-}
+# Configured from DATABASE_URL / DATABASE_REPLICA_URL, see config/database.py;
+# defaults to db.sqlite3 in WAL mode with persistent connections
+DATABASES = databases_from_env(BASE_DIR)
+# Dashboards, listings and exports read from the 'replica' alias when one is configured
+DATABASE_ROUTERS = ['complaints.replicas.ReplicaRouter']
+REPLICA_DATABASE = 'replica'
+# Seconds a client that just wrote keeps reading from the primary, above the replica's usual lag
+REPLICA_LAG_SECONDS = 5
 
 
 # Password validation
@@ -134,3 +139,70 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 ## Media files settings ###
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+
+### Cache settings ###
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'gwcl-complaints',
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+        },
+    },
+    # Rendered complaint rows and timelines, kept apart so they never evict dashboard sections or locks
+    'fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'gwcl-fragments',
+        'OPTIONS': {
+            'MAX_ENTRIES': 20000,
+        },
+    },
+}
+# Seconds a public dashboard section stays fresh without a complaint change
+PUBLIC_DASHBOARD_CACHE_TTL = 60
+# Seconds a rendered complaint row or status timeline is kept; a change to the complaint replaces it sooner
+FRAGMENT_CACHE_TTL = 60 * 60 * 24
+
+### Complaint SLA policy ###
+# Hours allowed per priority before an open complaint is overdue
+COMPLAINT_SLA_HOURS = {
+    'critical': 12,
+    'high': 24,
+    'medium': 48,
+    'low': 72,
+}
+# Optional stricter limits per category, e.g. {'no_water': 24}
+COMPLAINT_SLA_CATEGORY_HOURS = {}
+
+### Image processing ###
+# Background threads that process uploaded complaint photos; 0 processes them inline
+IMAGE_PROCESSING_WORKERS = 2
+
+### Live dashboard updates ###
+# Served by the ASGI app (e.g. uvicorn config.asgi:application).
+# 'local' fans events out within one process; 'database' shares them between worker processes.
+LIVE_UPDATES_BROKER = 'local'
+
+### Automatic assignment ###
+# Route each new complaint to the least-loaded eligible staff member as it is submitted
+AUTO_ASSIGN_ON_SUBMIT = False
+# Seconds the per-process engine routing submissions trusts its workloads before reloading them
+AUTO_ASSIGN_ENGINE_TTL = 60
+
+### Status history archival ###
+# Status updates of complaints closed and untouched for this many months move to StatusHistoryArchive
+STATUS_HISTORY_ARCHIVE_MONTHS = 6
+
+### Request profiling ###
+# Per-request query counts and latency kept in memory for the manager profiling report
+REQUEST_PROFILING = True
+REQUEST_PROFILE_BUFFER_SIZE = 2000
+# Requests running more queries than their view's budget are logged as warnings
+DEFAULT_QUERY_BUDGET = 30
+QUERY_BUDGETS = {
+    'public_dashboard': 10,
+    'manager_dashboard': 15,
+    'staff_performance': 6,
+    'api_complaint_status': 6,
+}
+